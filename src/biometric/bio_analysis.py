@@ -1,8 +1,14 @@
+import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.ticker import PercentFormatter
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+from concentration import top_k, pareto_head
+from correlation_stats import sufficient_stats, fit_stats, plot_fit
+
 # ==========================================
 # 1. LOAD CLEANED DATA
 # ==========================================
@@ -42,6 +48,9 @@ plt.rcParams['figure.figsize'] = (12, 6)
 
 print("\n--- Generating Visuals ---")
 
+# One groupby feeds the bottleneck, Pareto and split views below
+pincode_totals = monthly_df.groupby('pincode')['total'].sum()
+
 # --- VISUAL 1: The "Mandatory" Surge (Trends) ---
 plt.figure()
 trends = monthly_df.groupby('plot_date')[['bio_age_5_17', 'bio_age_above_17']].sum()
@@ -56,7 +65,7 @@ print("1. Generated: biometric_visual_1_trends.png")
 
 # --- VISUAL 2: The "Triple-Threat" Check (Bottlenecks) ---
 plt.figure()
-top_centers = monthly_df.groupby('pincode')['total'].sum().nlargest(10).sort_values(ascending=False)
+top_centers = top_k(pincode_totals, 10)
 sns.barplot(x=top_centers.index, y=top_centers.values, palette='magma')
 plt.title('Biometric Bottlenecks: Top 10 High-Volume Centers', fontsize=14, fontweight='bold')
 plt.xlabel('Pincode')
@@ -66,14 +75,17 @@ plt.savefig('../../reports/figures/biometric_visual_2_bottlenecks.png')
 print("2. Generated: biometric_visual_2_bottlenecks.png")
 
 # --- VISUAL 3: Correlation (The School Run) ---
-plt.figure(figsize=(8, 8))
-sns.regplot(data=monthly_df, x='bio_age_above_17', y='bio_age_5_17', 
-            scatter_kws={'alpha':0.5, 'color':'purple'}, line_kws={'color':'orange'})
+# Fit from running sums; the points are drawn as a density, not one marker per row
+school_fit = fit_stats(sufficient_stats(monthly_df, 'bio_age_above_17', 'bio_age_5_17')).iloc[0]
+fig, ax = plt.subplots(figsize=(8, 8))
+plot_fit(ax, monthly_df, 'bio_age_above_17', 'bio_age_5_17', school_fit, color='purple', line_color='orange')
 plt.title('Correlation: Adult vs Child Updates', fontsize=14, fontweight='bold')
 plt.xlabel('Adult Updates')
 plt.ylabel('Child Updates (Mandatory)')
 # Add Score
-corr = monthly_df['bio_age_above_17'].corr(monthly_df['bio_age_5_17'])
+corr = school_fit['pearson_r']
+# Same sums per month show whether the link holds outside the surge
+monthly_fit = fit_stats(sufficient_stats(monthly_df, 'bio_age_above_17', 'bio_age_5_17', by='month_year'))
 plt.text(monthly_df['bio_age_above_17'].max()*0.05, monthly_df['bio_age_5_17'].max()*0.9, 
          f'Correlation (r) = {corr:.3f}', bbox=dict(facecolor='white', alpha=0.8), fontsize=12)
 plt.tight_layout()
@@ -81,9 +93,8 @@ plt.savefig('../../reports/figures/biometric_visual_3_correlation.png')
 print("3. Generated: biometric_visual_3_correlation.png")
 
 # --- VISUAL 4: Pareto Efficiency (Concentration) ---
-# Prepare Data
-pincode_stats = monthly_df.groupby('pincode')['total'].sum().sort_values(ascending=False).reset_index()
-pincode_stats['cumulative_percentage'] = pincode_stats['total'].cumsum() / pincode_stats['total'].sum() * 100
+# Prepare Data (only the top 20 are ranked, not every pincode)
+pincode_stats, k_at_50 = pareto_head(pincode_totals, k=20, cut=50)
 
 plt.figure()
 ax1 = plt.gca()
@@ -128,7 +139,8 @@ print(f"1. Total Mandatory Updates (Kids): {monthly_df['bio_age_5_17'].sum()}")
 print(f"2. Total Voluntary Updates (Adults): {monthly_df['bio_age_above_17'].sum()}")
 ratio = monthly_df['bio_age_5_17'].sum() / monthly_df['bio_age_above_17'].sum()
 print(f"   -> Ratio: {ratio:.2f} Kids for every 1 Adult.")
-print(f"3. Correlation Score: {corr:.3f}")
+print(f"3. Correlation Score: {corr:.3f} (monthly range {monthly_fit['pearson_r'].min():.3f} to {monthly_fit['pearson_r'].max():.3f})")
 print(f"4. Busiest Center: {pincode_stats.iloc[0]['pincode']} ({pincode_stats.iloc[0]['total']} updates)")
+print(f"5. Pareto Cut: {k_at_50} of {len(pincode_totals)} centers handle 50% of the load")
 print("="*40)
 print("\n✅ DONE! All 5 biometric visuals saved.")
\ No newline at end of file
@@ -1,10 +1,18 @@
+import os
+import sys
 import pandas as pd
 import math
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+from decision_table import DecisionTable, content_hash
+from cohort_projection import upcoming_mbu
+
 # ==========================================
 # ⚙️ SYSTEM INITIALIZATION
 # ==========================================
 FILE_PATH = '../../data/processed/cleaned_monthly_biometric_data.csv'
+BACKLOG_PATH = '../../data/processed/biometric_backlog.csv'  # built by bio_backlog.py
+PROJECTION_MONTHS = 12  # Look-ahead for mandatory updates falling due (cohort_projection.py)
 
 print("🔄 Initializing 'School Camp Scheduler' Protocol...")
 
@@ -24,6 +32,17 @@ try:
     # Capacity of one Mobile Biometric Kit (Students processed per day)
     KIT_CAPACITY_DAILY = 60 
     
+    # 3. Optional: update-shortfall ranking among children due (Indicator 4)
+    backlog_stats = None
+    if os.path.exists(BACKLOG_PATH):
+        backlog_stats = pd.read_csv(BACKLOG_PATH, dtype={'pincode': str}).set_index('pincode')
+        print(f"📉 Backlog ranking loaded for {len(backlog_stats)} pincodes")
+    
+    # 4. Optional: mandatory updates projected from enrolment cohorts
+    projected_mbu = upcoming_mbu(PROJECTION_MONTHS)
+    if projected_mbu is not None:
+        print(f"🔮 Cohort projection loaded: next {PROJECTION_MONTHS} months for {len(projected_mbu)} pincodes")
+    
     print(f"✅ System Online!")
     print(f"📊 Threshold for Camp Deployment: > {SCHOOL_CLUSTER_THRESHOLD} students/year")
     print("---------------------------------------------------\n")
@@ -49,13 +68,29 @@ def deploy_unit(pincode):
     child_vol = int(stats['bio_age_5_17'])
     adult_vol = int(stats['bio_age_above_17'])
     
-    # LOGIC: Do we send a van?
-    if child_vol > SCHOOL_CLUSTER_THRESHOLD:
+    # CONTEXT: Is this area falling behind the district on child updates?
+    backlog_note = None
+    if backlog_stats is not None and pincode in backlog_stats.index:
+        row = backlog_stats.loc[pincode]
+        if row['backlog'] > 0:
+            # A relative shortfall index (capped at the children due), not a head count
+            backlog_note = (f"⏳ Update Shortfall: child updates run at {row['equity_index']:.2f}x the district "
+                            f"rate, {int(row['due_children'])} children due here "
+                            f"(shortfall score {int(row['backlog'])}, rank #{int(row['rank'])}).")
+    
+    # FORWARD LOOK: children whose age-5/15 updates fall due in the coming year
+    projected = None
+    if projected_mbu is not None and pincode in projected_mbu.index:
+        projected = int(round(projected_mbu[pincode]))
+    
+    # LOGIC: Do we send a van? (past volume, or the volume about to fall due)
+    if child_vol > SCHOOL_CLUSTER_THRESHOLD or (projected or 0) > SCHOOL_CLUSTER_THRESHOLD:
         # Calculate Logistics
+        child_vol = max(child_vol, projected or 0)
         total_days_needed = math.ceil(child_vol / KIT_CAPACITY_DAILY)
         kits_recommended = math.ceil(total_days_needed / 5) # Assume a 5-day "Camp Week"
         
-        return {
+        result = {
             "status": "🚨 DEPLOY MOBILE UNIT",
             "message": f"High Concentration of Students detected ({child_vol} mandatory updates).",
             "action": f"LOGISTICS: Deploy {kits_recommended} Mobile Kits for 1 Week.",
@@ -64,13 +99,34 @@ def deploy_unit(pincode):
         }
     
     else:
-        return {
+        result = {
             "status": "✅ STANDARD OPERATION",
             "message": f"Student volume is manageable ({child_vol} updates).",
             "action": "ACTION: Redirect students to nearest Permanent Center.",
             "impact": "No mobile intervention required.",
             "color": "green"
         }
+    
+    if backlog_note:
+        result["backlog"] = backlog_note
+    if projected is not None:
+        result["projection"] = f"🔮 Projected: ~{projected} mandatory updates due in the next {PROJECTION_MONTHS} months."
+    return result
+
+# ==========================================
+# ⚡ COMPILED KIOSK TABLE
+# ==========================================
+# Every pincode's answer is precomputed once, so a decision is a single indexed lookup.
+def compile_camp_table(table=None):
+    """Builds the table, or returns `table` as-is if the thresholds and per-pincode inputs are unchanged."""
+    fingerprint = (SCHOOL_CLUSTER_THRESHOLD, KIT_CAPACITY_DAILY, PROJECTION_MONTHS,
+                   content_hash(pincode_stats, backlog_stats, projected_mbu))
+    if table is not None and table.is_current(fingerprint):
+        return table
+    return DecisionTable.compile(pincode_stats.index, [], deploy_unit, fingerprint)
+
+camp_table = compile_camp_table()
+deploy_unit_fast = camp_table.lookup
 
 # ==========================================
 # 🚀 INTERACTIVE DEMO LOOP
@@ -84,7 +140,7 @@ if __name__ == "__main__":
         if pincode_in.lower() == 'q': break
         
         # Run Logic
-        result = deploy_unit(pincode_in)
+        result = deploy_unit_fast(pincode_in)
         
         # Display Result
         print("\n" + "="*40)
@@ -93,4 +149,8 @@ if __name__ == "__main__":
         print(result['message'])
         print(result['action'])
         if 'impact' in result:
-            print(f"BENEFIT: {result['impact']}")
\ No newline at end of file
+            print(f"BENEFIT: {result['impact']}")
+        if 'backlog' in result:
+            print(result['backlog'])
+        if 'projection' in result:
+            print(result['projection'])
\ No newline at end of file
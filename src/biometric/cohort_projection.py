@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+from schema import read_source
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+PROJECTION_PATH = '../../data/processed/mbu_projection.csv'
+
+HORIZON_MONTHS = 24         # How far ahead the projection runs
+MBU_AGES = (60, 180)        # Mandatory biometric updates fall due at 5 and 15 (in months)
+
+# Age range (in months) children of each enrolment band can be, ages uniform within it
+COHORTS = {
+    'age_0_5': (0, 60),
+    'age_5_17': (60, 216),
+}
+
+UPTAKE_HAZARD = 0.15        # Share of still-pending children who update each month once due
+MAX_DELAY = 24              # Children who have not updated 2 years after the due date are dropped
+
+
+# ==========================================
+# 🧬 AGEING KERNELS
+# ==========================================
+def due_kernel(age_range, mbu_ages=MBU_AGES):
+    """
+    Expected mandatory updates falling due `lag` months after enrolment, per
+    child enrolled in a band covering `age_range` months (uniform ages).
+    """
+    lo, hi = age_range
+    ages = np.arange(lo, hi)
+    kernel = np.zeros(max(mbu_ages) + 1)
+    for mbu in mbu_ages:
+        lags = mbu - ages[ages <= mbu]
+        np.add.at(kernel, lags, 1.0 / len(ages))
+    return kernel
+
+
+def hazard_kernel(hazard=UPTAKE_HAZARD, max_delay=MAX_DELAY):
+    """Probability that a due update is done `d` months late (geometric, truncated)."""
+    d = np.arange(max_delay)
+    return hazard * (1 - hazard) ** d
+
+
+def cohort_kernels(cohorts=COHORTS):
+    """(cohort x lag) matrix: expected updates per enrolled child, `lag` months later."""
+    uptake = hazard_kernel()
+    kernels = [np.convolve(due_kernel(ages), uptake) for ages in cohorts.values()]
+    return np.vstack(kernels)
+
+
+# ==========================================
+# 🧠 PROJECTION ENGINE (pincode x cohort x month)
+# ==========================================
+def cohort_matrix(enrol_df, cohorts=COHORTS):
+    """Raw enrolment rows -> (pincode x cohort x month) array of children enrolled."""
+    pin_codes, pincodes = pd.factorize(enrol_df['pincode'].astype(str))
+    periods = enrol_df['date'].dt.to_period('M')
+    first = periods.min()
+    month_idx = periods.array.asi8 - first.ordinal
+
+    counts = np.zeros((len(pincodes), len(cohorts), int(month_idx.max()) + 1))
+    for c, col in enumerate(cohorts):
+        np.add.at(counts[:, c], (pin_codes, month_idx), enrol_df[col].to_numpy(dtype=np.float64))
+    return pd.Index(pincodes, name='pincode'), first, counts
+
+
+def project(counts, kernels, horizon=HORIZON_MONTHS):
+    """
+    Ages every cohort forward in one contraction:
+        demand[p, t] = sum_c sum_m counts[p, c, m] * kernels[c, t - m]
+    The (cohort x enrol month x calendar month) lag tensor is built once by
+    fancy indexing; einsum turns the sum into a single matrix product.
+    """
+    n_months = counts.shape[2]
+    months_out = np.arange(n_months + horizon)
+    lag = months_out[None, :] - np.arange(n_months)[:, None]          # (m, t)
+    valid = (lag >= 0) & (lag < kernels.shape[1])
+    lagged = np.where(valid[None], kernels[:, np.clip(lag, 0, kernels.shape[1] - 1)], 0.0)  # (c, m, t)
+    return np.einsum('pcm,cmt->pt', counts, lagged, optimize=True)
+
+
+def build_projection(enrol_df, horizon=HORIZON_MONTHS):
+    """Long table (pincode, month, projected_mbu) for the months after the data ends."""
+    pincodes, first, counts = cohort_matrix(enrol_df)
+    demand = project(counts, cohort_kernels(), horizon)
+    future = demand[:, counts.shape[2]:]
+    months = pd.period_range(first + counts.shape[2], periods=horizon, freq='M')
+    return pd.DataFrame({
+        'pincode': np.repeat(pincodes.to_numpy(), horizon),
+        'month': np.tile(months.astype(str), len(pincodes)),
+        'projected_mbu': future.ravel().round(1),
+    }), demand
+
+
+def load_projection(path=PROJECTION_PATH):
+    """(pincode x month) table of projected mandatory updates, or None if not built."""
+    if not os.path.exists(path):
+        return None
+    table = pd.read_csv(path, dtype={'pincode': str})
+    return table.pivot(index='pincode', columns='month', values='projected_mbu')
+
+
+def upcoming_mbu(months=12, path=PROJECTION_PATH):
+    """Projected mandatory updates per pincode over the next `months` months."""
+    projection = load_projection(path)
+    if projection is None:
+        return None
+    return projection.iloc[:, :months].sum(axis=1)
+
+
+# ==========================================
+# 🚀 BUILD THE PROJECTION
+# ==========================================
+if __name__ == "__main__":
+    print("🔄 Ageing enrolment cohorts forward...")
+    enrol = read_source('enrolment')
+
+    t0 = time.perf_counter()
+    table, demand = build_projection(enrol)
+    elapsed = time.perf_counter() - t0
+    n_pins = table['pincode'].nunique()
+    print(f"✅ {n_pins} pincodes x {HORIZON_MONTHS} months projected in {elapsed * 1000:.1f} ms")
+
+    due = table.groupby('pincode')['projected_mbu'].sum().nlargest(10)
+    print("\n--- Top 10 Pincodes by Mandatory Updates Due (next 24 months) ---")
+    print(due.round(0))
+
+    monthly = table.groupby('month')['projected_mbu'].sum()
+    print(f"\n📅 Peak month: {monthly.idxmax()} ({monthly.max():.0f} updates across all pincodes)")
+
+    table.to_csv(PROJECTION_PATH, index=False)
+    print(f"\n🎉 Saved to '{PROJECTION_PATH}'")
@@ -1,7 +1,14 @@
+import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+from concentration import top_k, pareto_head
+from correlation_stats import sufficient_stats, rank_stats, fit_stats, plot_fit
+from query import query
+
 # ---------------------------------------------------------
 # 1. LOAD CLEANED DATA
 # ---------------------------------------------------------
@@ -33,7 +40,8 @@ print("\n--- Generating Enrollment Insights ---")
 # VISUAL 1: The "Birth Rate Proxy" (Age Trends)
 # ---------------------------------------------------------
 plt.figure()
-trends = df.groupby(time_col)[['age_0_5', 'age_5_17', 'age_18_greater']].sum()
+# Repeated slices go through the cached query layer instead of regrouping df
+trends = query('enrolment', by='month')
 
 # Plot Lines
 plt.plot(trends.index, trends['age_0_5'], marker='o', label='Newborns (0-5)', linewidth=3, color='#2ca02c') # Green for Growth
@@ -52,7 +60,7 @@ print("1. Generated: enrollment_visual_1_trends.png (Trends)")
 # ---------------------------------------------------------
 plt.figure()
 # Filter for top baby enrollment centers
-top_babies = df.groupby('pincode')['age_0_5'].sum().nlargest(10).sort_values(ascending=False)
+top_babies = query('enrolment', measures='age_0_5', by='pincode', top=10)['age_0_5']
 
 sns.barplot(x=top_babies.index, y=top_babies.values, palette='Greens_r')
 plt.title('Maternity Hotspots: Top 10 Pincodes for New Birth Enrollments', fontsize=14, fontweight='bold')
@@ -67,14 +75,15 @@ print("2. Generated: enrollment_visual_2_hotspots.png (Baby Hotspots)")
 # ---------------------------------------------------------
 plt.figure()
 # We look for where adults are enrolling NEW Aadhaars (Suspicious/Rare)
-top_adults = df.groupby('pincode')['age_18_greater'].sum().nlargest(10).sort_values(ascending=False)
+adult_totals = query('enrolment', measures='age_18_greater', by='pincode')['age_18_greater']
+top_adults = top_k(adult_totals, 10)
 
 sns.barplot(x=top_adults.index, y=top_adults.values, palette='Reds_r')
 plt.title('Anomaly Detection: High Volume of NEW Adult Enrollments (18+)', fontsize=14, fontweight='bold')
 plt.xlabel('Pincode')
 plt.ylabel('New Adult Enrollments')
 # Add a threshold line for "Normal"
-avg_adult = df.groupby('pincode')['age_18_greater'].sum().mean()
+avg_adult = adult_totals.mean()
 plt.axhline(avg_adult, color='blue', linestyle='--', label=f'Regional Avg ({int(avg_adult)})')
 plt.legend()
 plt.tight_layout()
@@ -84,17 +93,18 @@ print("3. Generated: enrollment_visual_3_anomalies.png (Adult Anomalies)")
 # ---------------------------------------------------------
 # VISUAL 4: Sibling Correlation (Scatter)
 # ---------------------------------------------------------
-plt.figure(figsize=(10, 8))
-sns.regplot(data=df, x='age_0_5', y='age_5_17', 
-            scatter_kws={'alpha':0.5, 'color':'purple'}, 
-            line_kws={'color':'orange', 'lw':2})
+# Fit from running sums; the points are drawn as a density, not one marker per row
+sibling_fit = fit_stats(sufficient_stats(df, 'age_0_5', 'age_5_17')).iloc[0]
+fig, ax = plt.subplots(figsize=(10, 8))
+plot_fit(ax, df, 'age_0_5', 'age_5_17', sibling_fit, color='purple', line_color='orange')
 
 plt.title('The "Sibling Effect": Correlation between 0-5 and 5-17 Enrollments', fontsize=14, fontweight='bold')
 plt.xlabel('Newborn Enrollments (0-5)')
 plt.ylabel('Child Enrollments (5-17)')
 
 # Calc Correlation
-corr = df['age_0_5'].corr(df['age_5_17'])
+corr = sibling_fit['pearson_r']
+spearman = fit_stats(rank_stats(df, 'age_0_5', 'age_5_17')).iloc[0]['pearson_r']
 plt.text(df['age_0_5'].max()*0.05, df['age_5_17'].max()*0.9, 
          f'Correlation (r) = {corr:.3f}', 
          bbox=dict(facecolor='white', alpha=0.8), fontsize=12, fontweight='bold')
@@ -117,28 +127,27 @@ df = pd.read_csv(file_path)
 df['pincode'] = df['pincode'].astype(str)
 
 # Aggregate Stats by Pincode
-pincode_stats = df.groupby('pincode')[['age_0_5', 'age_5_17', 'age_18_greater']].sum()
+pincode_stats = query('enrolment', by='pincode')
 pincode_stats['total'] = pincode_stats.sum(axis=1)
-pincode_stats = pincode_stats.sort_values('total', ascending=False)
 
 # ---------------------------------------------------------
 # VISUAL 5: Pareto Efficiency (Resource Optimization)
 # ---------------------------------------------------------
-# Calculate Cumulative %
-pincode_stats['cumulative_percentage'] = pincode_stats['total'].cumsum() / pincode_stats['total'].sum() * 100
+# Calculate Cumulative % (only the top 20 are ranked, not every pincode)
+pareto_df, k_at_50 = pareto_head(pincode_stats['total'], k=20, cut=50)
 
 plt.figure(figsize=(12, 6))
 ax1 = plt.gca()
 
 # Bar Chart (Volume)
-sns.barplot(x=pincode_stats.head(20).index, y=pincode_stats.head(20)['total'], color='#2ca02c', ax=ax1, alpha=0.8)
+sns.barplot(x=pareto_df['pincode'], y=pareto_df['total'], color='#2ca02c', ax=ax1, alpha=0.8)
 ax1.set_ylabel('Total Enrollments', color='#2ca02c', fontweight='bold')
 ax1.tick_params(axis='y', labelcolor='#2ca02c')
 ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45)
 
 # Line Chart (Cumulative %)
 ax2 = ax1.twinx()
-sns.lineplot(x=pincode_stats.head(20).index, y=pincode_stats.head(20)['cumulative_percentage'], color='#d62728', linewidth=3, marker='D', ax=ax2)
+sns.lineplot(x=pareto_df['pincode'], y=pareto_df['cumulative_percentage'], color='#d62728', linewidth=3, marker='D', ax=ax2)
 ax2.set_ylabel('Cumulative % Load', color='#d62728', fontweight='bold')
 ax2.yaxis.set_major_formatter(PercentFormatter())
 ax2.set_ylim(0, 110)
@@ -154,7 +163,7 @@ print("Generated: enrollment_visual_5_pareto.png")
 # VISUAL 6: Demographic DNA (Stacked Bar)
 # ---------------------------------------------------------
 # Get Top 10 Busiest Centers
-top_10 = pincode_stats.head(10)[['age_0_5', 'age_5_17', 'age_18_greater']]
+top_10 = pincode_stats.loc[pareto_df['pincode'].head(10), ['age_0_5', 'age_5_17', 'age_18_greater']]
 
 # Plot Stacked Bar
 ax = top_10.plot(kind='bar', stacked=True, color=['#2ca02c', '#ff7f0e', '#d62728'], figsize=(12, 6), width=0.8)
@@ -181,6 +190,7 @@ print("="*40)
 print(f"1. Total Newborns (0-5): {df['age_0_5'].sum()}")
 print(f"2. Total Adults (18+):   {df['age_18_greater'].sum()}")
 print(f"   -> Ratio: {df['age_0_5'].sum() / df['age_18_greater'].sum():.1f} Babies for every 1 Adult.")
-print(f"3. Sibling Correlation:  {corr:.3f} (Validates 'Family Visit' theory)")
+print(f"3. Sibling Correlation:  {corr:.3f} (Spearman {spearman:.3f}) (Validates 'Family Visit' theory)")
+print(f"4. Pareto Cut: {k_at_50} of {len(pincode_stats)} centers handle 50% of enrollments")
 print("="*40)
 print("\n✅ DONE! All enrollment images saved.")
\ No newline at end of file
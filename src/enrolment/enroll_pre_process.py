@@ -1,19 +1,28 @@
-import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+from parallel_aggregate import partitioned_groupby_sum
+from schema import read_source
+
+# Set UIDAI_WORKERS > 1 to run the monthly aggregation on a process pool
+# (rows are partitioned by state/district, one partition per worker).
+WORKERS = int(os.environ.get('UIDAI_WORKERS', '1'))
 
 # ---------------------------------------------------------
 # 1. LOAD DATA
 # ---------------------------------------------------------
 # Replace with the actual filename of your enrollment dataset
+# read_source checks the header/values and loads with explicit dtypes
 file_path = '../../data/raw/enrolment.csv'
-df = pd.read_csv(file_path)
+df = read_source('enrolment', file_path)
 
 print(f"Original Rows: {len(df)}")
 
 # ---------------------------------------------------------
 # 2. PRE-PROCESSING
 # ---------------------------------------------------------
-# A. Convert 'date'
-df['date'] = pd.to_datetime(df['date'], dayfirst=True)
+# A. 'date' is already parsed by read_source (DD-MM-YYYY)
 
 # B. Convert 'pincode' to string
 df['pincode'] = df['pincode'].astype(str)
@@ -24,9 +33,14 @@ df['pincode'] = df['pincode'].astype(str)
 # Standardize everything to Monthly sums
 df['month_year'] = df['date'].dt.to_period('M')
 
-monthly_df = df.groupby(['month_year', 'state', 'district', 'pincode'])[[ 
-    'age_0_5', 'age_5_17', 'age_18_greater' 
-]].sum().reset_index()
+if WORKERS > 1:
+    monthly_df = partitioned_groupby_sum(df, ['month_year', 'state', 'district', 'pincode'], [
+        'age_0_5', 'age_5_17', 'age_18_greater'
+    ], workers=WORKERS)
+else:
+    monthly_df = df.groupby(['month_year', 'state', 'district', 'pincode'])[[ 
+        'age_0_5', 'age_5_17', 'age_18_greater' 
+    ]].sum().reset_index()
 
 # Add timestamp for plotting
 monthly_df['plot_date'] = monthly_df['month_year'].dt.to_timestamp()
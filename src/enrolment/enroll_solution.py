@@ -1,6 +1,12 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+from decision_table import DecisionTable
+from audit_log import AuditLog, version_of, NO_INPUT
+
 # ==========================================
 # ⚙️ SYSTEM INITIALIZATION
 # ==========================================
@@ -17,13 +23,13 @@ try:
     # Identify "Maternity Hubs" (Top 20% by Newborn Volume)
     newborn_stats = df.groupby('pincode')['age_0_5'].sum()
     maternity_threshold = newborn_stats.quantile(0.80)
-    maternity_hubs = newborn_stats[newborn_stats > maternity_threshold].index.tolist()
+    maternity_hubs = set(newborn_stats[newborn_stats > maternity_threshold].index)
     
     # Identify "Fraud Risk Zones" (Top 5% by Adult Volume)
     # High adult enrollment is rare/suspicious in Mumbai
     adult_stats = df.groupby('pincode')['age_18_greater'].sum()
     fraud_threshold = adult_stats.quantile(0.95)
-    fraud_zones = adult_stats[adult_stats > fraud_threshold].index.tolist()
+    fraud_zones = set(adult_stats[adult_stats > fraud_threshold].index)
     
     print(f"✅ System Online!")
     print(f"👶 Maternity Hubs Identified: {len(maternity_hubs)} centers")
@@ -44,8 +50,6 @@ def assign_queue(pincode, age_group, family_size):
     is_maternity_hub = pincode in maternity_hubs
     is_risk_zone = pincode in fraud_zones
     
-    print(f"\n--- Processing User at Center {pincode} ---")
-    
     # LOGIC 1: THE "GHOST HUNTER" (Fraud Prevention)
     # If an Adult is enrolling in a High-Risk Zone, trigger security check.
     if age_group == "Adult (18+)" and is_risk_zone:
@@ -84,6 +88,50 @@ def assign_queue(pincode, age_group, family_size):
         "color": "white"
     }
 
+# ==========================================
+# ⚡ COMPILED KIOSK TABLE
+# ==========================================
+# Every (pincode x applicant type x family size) answer is precomputed once,
+# so a kiosk decision is a single indexed lookup.
+AGE_GROUPS = ["Newborn (0-5)", "Child (5-17)", "Adult (18+)"]
+FAMILY_SIZES = range(1, 11)   # larger groups fall back to assign_queue()
+
+def compile_queue_table(table=None):
+    """Builds the table, or returns `table` as-is if the thresholds are unchanged."""
+    fingerprint = (maternity_threshold, fraud_threshold, frozenset(maternity_hubs), frozenset(fraud_zones))
+    if table is not None and table.is_current(fingerprint):
+        return table
+    return DecisionTable.compile(newborn_stats.index, [AGE_GROUPS, FAMILY_SIZES], assign_queue, fingerprint)
+
+queue_table = compile_queue_table()
+lookup_queue = queue_table.lookup
+
+# ==========================================
+# 🧾 DECISION AUDIT TRAIL
+# ==========================================
+# Every kiosk decision goes to the buffered audit log (written in the background),
+# so security checks can be re-aggregated per pincode to tune the fraud threshold.
+audit = AuditLog()
+AUDIT_VERSION = version_of(maternity_threshold, fraud_threshold, maternity_hubs, fraud_zones)
+AGE_CODES = {group: i for i, group in enumerate(AGE_GROUPS)}
+QUEUE_OUTCOMES = {
+    "🛑 SECURITY CHECK": "SECURITY_CHECK",
+    "👶 PRIORITY LANE A": "PRIORITY_LANE",
+    "👨‍👩‍👧 FAMILY BOOTH": "FAMILY_BOOTH",
+    "Standard Queue": "STANDARD",
+}
+
+def assign_queue_fast(pincode, age_group, family_size):
+    """Same answer as assign_queue(), served from the compiled table (and audited)."""
+    try:
+        result = lookup_queue(pincode, age_group, family_size)
+    except KeyError:
+        result = assign_queue(pincode, age_group, family_size)
+    audit.record('queue', pincode, QUEUE_OUTCOMES[result['queue']],
+                 age_group=AGE_CODES.get(age_group, NO_INPUT), family_size=family_size,
+                 version=AUDIT_VERSION)
+    return result
+
 # ==========================================
 # 🚀 INTERACTIVE DEMO LOOP
 # ==========================================
@@ -108,7 +156,8 @@ if __name__ == "__main__":
         size_in = int(input("3. Total Family Members present: "))
         
         # Run Logic
-        result = assign_queue(pincode_in, age_cat, size_in)
+        print(f"\n--- Processing User at Center {pincode_in.strip()} ---")
+        result = assign_queue_fast(pincode_in, age_cat, size_in)
         
         # Display Result
         print("\n" + "="*40)
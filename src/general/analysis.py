@@ -1,6 +1,8 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from concentration import top_k, pareto_head
+from correlation_stats import sufficient_stats, fit_stats, plot_fit
 
 # ---------------------------------------------------------
 # 1. LOAD THE CLEANED DATA
@@ -40,6 +42,9 @@ if 'total_updates' not in df.columns:
 # ---------------------------------------------------------
 sns.set_style("whitegrid")
 
+# One groupby feeds every "top pincodes" view below
+pincode_totals = df.groupby('pincode')['total_updates'].sum()
+
 # A. The "Compliance Tsunami" (Trend Analysis)
 plt.figure(figsize=(12, 6))
 # Group by time column
@@ -57,7 +62,7 @@ print("Generated: ../../reports/figures/visual_1_trends.png")
 
 # B. The "Chronic Bottleneck" (Top 10 Pincodes)
 plt.figure(figsize=(12, 6))
-top_pincodes = df.groupby('pincode')['total_updates'].sum().nlargest(10).sort_values(ascending=False)
+top_pincodes = top_k(pincode_totals, 10)
 sns.barplot(x=top_pincodes.index, y=top_pincodes.values, palette='Reds_r')
 plt.title('Structural Bottlenecks: Top 10 High-Stress Pincodes', fontsize=14, fontweight='bold')
 plt.xlabel('Pincode')
@@ -69,7 +74,7 @@ print("Generated: ../../reports/figures/visual_2_bottlenecks.png")
 # C. The "Red Zone" Heatmap
 plt.figure(figsize=(14, 8))
 # Get top 15 busy pincodes
-top_15_list = df.groupby('pincode')['total_updates'].sum().nlargest(15).index
+top_15_list = top_k(pincode_totals, 15).index
 # Filter data for only these pincodes
 subset = df[df['pincode'].isin(top_15_list)]
 
@@ -84,15 +89,15 @@ plt.savefig('../../reports/figures/visual_3_heatmap.png')
 print("Generated: ../../reports/figures/visual_3_heatmap.png")
 
 # --- VISUAL 5: Family Unit Correlation (Scatter Plot) ---
-plt.figure(figsize=(10, 8))
-sns.regplot(data=df, x='demo_age_above_17', y='demo_age_5_17', 
-            scatter_kws={'alpha':0.5, 's':60, 'color':'#005a8d'}, 
-            line_kws={'color':'#f37021', 'lw':3})
+# Fit from running sums; the points are drawn as a density, not one marker per row
+family_fit = fit_stats(sufficient_stats(df, 'demo_age_above_17', 'demo_age_5_17')).iloc[0]
+fig, ax = plt.subplots(figsize=(10, 8))
+plot_fit(ax, df, 'demo_age_above_17', 'demo_age_5_17', family_fit, color='#005a8d', line_color='#f37021')
 plt.title('Insight 3: Correlation between Adult and Child Updates', fontsize=14, fontweight='bold')
 plt.xlabel('Adult Updates (17+)', fontweight='bold')
 plt.ylabel('Child Updates (5-17)', fontweight='bold')
 # Calculate correlation
-corr_value = df['demo_age_above_17'].corr(df['demo_age_5_17'])
+corr_value = family_fit['pearson_r']
 plt.text(df['demo_age_above_17'].max()*0.05, df['demo_age_5_17'].max()*0.9, 
          f'Correlation (r) = {corr_value:.3f}', 
          bbox=dict(facecolor='white', alpha=0.8), fontsize=12, fontweight='bold')
@@ -105,15 +110,14 @@ print("5. Generated: ../../reports/figures/visual_5_correlation.png (Scatter Plo
 # ---------------------------------------------------------
 from matplotlib.ticker import PercentFormatter
 
-# 1. Prepare Data
-pareto_df = df.groupby('pincode')['total_updates'].sum().sort_values(ascending=False).reset_index()
-pareto_df['cumulative_percentage'] = pareto_df['total_updates'].cumsum() / pareto_df['total_updates'].sum() * 100
+# 1. Prepare Data (only the top 20 are ranked, not every pincode)
+pareto_df, k_at_50 = pareto_head(pincode_totals, k=20, cut=50)
 
 # 2. Plot
 fig, ax1 = plt.subplots(figsize=(12, 6))
 
 # Bar Chart (Volume)
-sns.barplot(data=pareto_df.head(20), x='pincode', y='total_updates', color='#005a8d', ax=ax1, alpha=0.8)
+sns.barplot(data=pareto_df, x='pincode', y='total_updates', color='#005a8d', ax=ax1, alpha=0.8)
 ax1.set_ylabel('Total Transactions (Volume)', color='#005a8d', fontweight='bold')
 ax1.tick_params(axis='y', labelcolor='#005a8d')
 ax1.set_xlabel('Top 20 Pincodes (Ranked by Load)', fontweight='bold')
@@ -121,7 +125,7 @@ ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45)
 
 # Line Chart (Cumulative %)
 ax2 = ax1.twinx()
-sns.lineplot(data=pareto_df.head(20), x='pincode', y='cumulative_percentage', color='#f37021', linewidth=3, marker='D', ax=ax2)
+sns.lineplot(data=pareto_df, x='pincode', y='cumulative_percentage', color='#f37021', linewidth=3, marker='D', ax=ax2)
 ax2.set_ylabel('Cumulative % of City-Wide Load', color='#f37021', fontweight='bold')
 ax2.tick_params(axis='y', labelcolor='#f37021')
 ax2.yaxis.set_major_formatter(PercentFormatter())
@@ -136,6 +140,6 @@ plt.savefig('../../reports/figures/visual_4_pareto.png')
 print("Generated: ../../reports/figures/visual_4_pareto.png")
 
 print("\n--- FINAL STRATEGIC INSIGHT ---")
-print("Optimization Opportunity: Focusing resources on just the Top 10 pincodes solves >50% of the entire city's congestion.")
+print(f"Optimization Opportunity: Focusing resources on just the Top {k_at_50} pincodes solves >50% of the entire city's congestion.")
 
 print("\n--- Success! All charts generated. ---")
\ No newline at end of file
@@ -0,0 +1,307 @@
+import os
+import glob
+import time
+import zlib
+import atexit
+import shutil
+import struct
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+AUDIT_DIR = '../../data/audit'
+
+RING_CAPACITY = 1 << 16        # Decisions held in memory between flushes (power of two)
+FLUSH_INTERVAL = 0.5           # Seconds between background flushes
+SEGMENT_BYTES = 4 * 1024**2    # Rotate to a new segment file past this size
+MAX_SEGMENTS = 64              # Oldest segments beyond this are deleted
+
+# One fixed-width record per decision (24 bytes)
+RECORD = np.dtype([
+    ('ts', '<f8'),             # unix time of the decision
+    ('pincode', '<u4'),        # center the visitor is at (0 = unparseable input)
+    ('kind', 'u1'),            # index into KINDS
+    ('outcome', 'u1'),         # index into OUTCOMES
+    ('age_group', 'u1'),       # index into the caller's age groups, NO_INPUT if n/a
+    ('family_size', 'u1'),     # capped at 254, NO_INPUT if n/a
+    ('target', '<u4'),         # redirect destination pincode, 0 if none
+    ('version', '<u4'),        # decision-state version (see version_of)
+])
+KINDS = ('queue', 'route')
+OUTCOMES = ('UNKNOWN', 'SECURITY_CHECK', 'PRIORITY_LANE', 'FAMILY_BOOTH', 'STANDARD',
+            'GREEN_ZONE', 'REDIRECT', 'STAY')
+NO_INPUT = 255
+U4_MAX = 2**32 - 1
+
+MAGIC = b'UIDAIAL1'
+HEADER = struct.Struct('<8sHH4x')   # magic, format version, record size
+FORMAT_VERSION = 1
+
+KIND_CODE = {name: i for i, name in enumerate(KINDS)}
+OUTCOME_CODE = {name: i for i, name in enumerate(OUTCOMES)}
+
+# ==========================================
+# 🧾 ASYNCHRONOUS DECISION AUDIT LOG
+# ==========================================
+# record() only drops a tuple into a preallocated ring under a lock: no I/O
+# and no formatting on the kiosk's path. A background thread drains the ring
+# every FLUSH_INTERVAL (or when it is half full), packs the batch into
+# fixed-width binary records and appends them to the current segment file.
+# Segments rotate by size, so the scanner can memory-read whole files as
+# NumPy record arrays.
+
+
+def version_of(*parts):
+    """Stable 32-bit id of the thresholds/sets a decision was made from."""
+    def canonical(value):
+        if isinstance(value, (set, frozenset)):
+            return sorted(canonical(v) for v in value)
+        if isinstance(value, dict):
+            return sorted((canonical(k), canonical(v)) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return [canonical(v) for v in value]
+        return value
+    return zlib.crc32(repr(canonical(parts)).encode())
+
+
+def _field(value, limit):
+    """`value` as an int in [0, limit], or None: bad kiosk input must never reach the writer."""
+    if type(value) is not int:
+        try:
+            value = int(str(value).strip())
+        except ValueError:
+            return None
+    return value if 0 <= value <= limit else None
+
+
+def _family_size(value):
+    if value == NO_INPUT:
+        return NO_INPUT
+    size = _field(value, float('inf'))
+    return NO_INPUT if size is None else min(size, 254)
+
+
+class AuditLog:
+    """Ring-buffered, background-flushed, append-only decision log."""
+
+    def __init__(self, directory=AUDIT_DIR, capacity=RING_CAPACITY, flush_interval=FLUSH_INTERVAL,
+                 segment_bytes=SEGMENT_BYTES, max_segments=MAX_SEGMENTS):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.directory = directory
+        self.capacity, self.mask = capacity, capacity - 1
+        self.flush_interval = flush_interval
+        self.segment_bytes, self.max_segments = segment_bytes, max_segments
+
+        self.ring = [None] * capacity
+        self.head = self.tail = 0        # next slot to write / next slot to flush
+        self.written = 0
+        self.dropped = 0                 # entries that could not be packed or stored
+        self.last_error = None
+        self._lock = threading.Lock()    # guards ring/head/tail
+        self._io_lock = threading.Lock() # one drain at a time
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        os.makedirs(directory, exist_ok=True)
+        existing = sorted(glob.glob(os.path.join(directory, 'audit-*.seg')))
+        self._seq = int(os.path.basename(existing[-1])[6:12]) + 1 if existing else 0
+        self._file = None
+
+        self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---------- producer side (kiosk path) ----------
+    def record(self, kind, pincode, outcome, age_group=NO_INPUT, family_size=NO_INPUT,
+               target=0, version=0):
+        # Out-of-range fields are encoded like unparseable input, not packed later
+        age = _field(age_group, NO_INPUT)
+        entry = (time.time(), _field(pincode, U4_MAX) or 0, KIND_CODE[kind], OUTCOME_CODE[outcome],
+                 NO_INPUT if age is None else age, _family_size(family_size),
+                 _field(target, U4_MAX) or 0, _field(version, U4_MAX) or 0)
+        with self._lock:
+            if self.head - self.tail >= self.capacity:
+                full = True
+            else:
+                self.ring[self.head & self.mask] = entry
+                self.head += 1
+                full = False
+                if self.head - self.tail == self.capacity >> 1:
+                    self._wake.set()
+        if full:
+            # Writer fell behind: flush here rather than lose a decision
+            try:
+                self._drain()
+            except OSError as err:
+                self.last_error = err
+                self.dropped += 1
+                return
+            self.record(kind, pincode, outcome, age_group, family_size, target, version)
+
+    # ---------- writer side ----------
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._drain()
+            except OSError as err:
+                # The batch stays in the ring and is retried on the next flush
+                self.last_error = err
+
+    def _drain(self):
+        with self._io_lock:
+            with self._lock:
+                head, tail = self.head, self.tail
+                if head == tail:
+                    return 0
+                a, b = tail & self.mask, head & self.mask
+                batch = self.ring[a:b] if a < b else self.ring[a:] + self.ring[:b]
+            records = self._pack(batch)
+            self._append(records.tobytes())
+            # Slots are only released once they are on disk
+            with self._lock:
+                self.tail = head
+            self.written += len(records)
+            return len(records)
+
+    def _pack(self, batch):
+        try:
+            return np.array(batch, dtype=RECORD)
+        except (OverflowError, ValueError, TypeError):
+            # One malformed entry must not cost the rest of the batch
+            good = []
+            for entry in batch:
+                try:
+                    good.append(np.array([entry], dtype=RECORD))
+                except (OverflowError, ValueError, TypeError) as err:
+                    self.last_error = err
+                    self.dropped += 1
+            return np.concatenate(good) if good else np.empty(0, dtype=RECORD)
+
+    def _append(self, data):
+        if self._file is None or self._file.tell() + len(data) > self.segment_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f'audit-{self._seq:06d}.seg')
+        self._seq += 1
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.itemsize))
+        segments = sorted(glob.glob(os.path.join(self.directory, 'audit-*.seg')))
+        for old in segments[:-self.max_segments]:
+            os.remove(old)
+
+    def flush(self):
+        """Writes everything recorded so far (blocks until it is on disk)."""
+        return self._drain()
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._drain()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ==========================================
+# 🔎 SCANNER + RE-AGGREGATION
+# ==========================================
+def scan(directory=AUDIT_DIR, kind=None, since=None):
+    """All records in the segment files as one NumPy record array (oldest first)."""
+    parts = []
+    for path in sorted(glob.glob(os.path.join(directory, 'audit-*.seg'))):
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            continue
+        magic, version, size = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION or size != RECORD.itemsize:
+            raise ValueError(f"'{path}' is not a version {FORMAT_VERSION} audit segment")
+        # A record cut short by a crash is ignored, not misread
+        count = (os.path.getsize(path) - HEADER.size) // RECORD.itemsize
+        parts.append(np.fromfile(path, dtype=RECORD, count=count, offset=HEADER.size))
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=RECORD)
+    if kind is not None:
+        records = records[records['kind'] == KIND_CODE[kind]]
+    if since is not None:
+        records = records[records['ts'] >= pd.Timestamp(since).timestamp()]
+    return records
+
+
+def by_pincode(records, adult_code):
+    """
+    Decisions re-aggregated per center, for feeding back into the fraud
+    thresholds: how often adults at a center were sent to a security check,
+    and how often visitors were redirected away. `adult_code` is the age
+    group code the caller recorded for adults (for the enrolment kiosk,
+    enroll_solution.AGE_CODES["Adult (18+)"]).
+    """
+    pins, inverse = np.unique(records['pincode'], return_inverse=True)
+    n = len(pins)
+
+    def count(mask):
+        return np.bincount(inverse[mask], minlength=n)
+
+    last_seen = np.zeros(n)
+    np.maximum.at(last_seen, inverse, records['ts'])
+
+    queue = records['kind'] == KIND_CODE['queue']
+    route = records['kind'] == KIND_CODE['route']
+    adults = queue & (records['age_group'] == adult_code)
+    checks = queue & (records['outcome'] == OUTCOME_CODE['SECURITY_CHECK'])
+    table = pd.DataFrame({
+        'pincode': pins.astype(str),
+        'queue_decisions': count(queue),
+        'adult_visitors': count(adults),
+        'security_checks': count(checks),
+        'route_decisions': count(route),
+        'redirects': count(route & (records['outcome'] == OUTCOME_CODE['REDIRECT'])),
+        'last_seen': pd.to_datetime(last_seen, unit='s'),
+    })
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table['security_rate'] = np.where(table['adult_visitors'] > 0,
+                                          table['security_checks'] / table['adult_visitors'], 0.0).round(3)
+    return table.sort_values(['security_checks', 'redirects'], ascending=False).reset_index(drop=True)
+
+
+# ==========================================
+# 🚀 LATENCY + SCAN DEMO
+# ==========================================
+if __name__ == "__main__":
+    # Synthetic decisions go to a scratch directory, never into the real audit trail
+    demo_dir = tempfile.mkdtemp(prefix='audit-demo-')
+    adult_code = 2
+    rng = np.random.default_rng(0)
+    pins = rng.choice(np.arange(400001, 400105), 200_000)
+    ages = rng.integers(0, 3, len(pins))
+    log = AuditLog(demo_dir)
+
+    t0 = time.perf_counter()
+    for pin, age in zip(pins.tolist(), ages.tolist()):
+        outcome = 'SECURITY_CHECK' if age == adult_code and pin % 17 == 0 else 'STANDARD'
+        log.record('queue', pin, outcome, age_group=age, family_size=1, version=1)
+    per_call = (time.perf_counter() - t0) / len(pins) * 1e6
+    log.close()
+    print(f"✅ {log.written} decisions logged, {per_call:.2f} µs per record() on the kiosk path")
+
+    t0 = time.perf_counter()
+    records = scan(demo_dir)
+    table = by_pincode(records, adult_code)
+    print(f"🔎 Scanned {len(records)} records and re-aggregated in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    print(table.head(5).to_string(index=False))
+    shutil.rmtree(demo_dir)
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 📐 CONCENTRATION ANALYTICS
+# ==========================================
+# Pareto / "who carries the load" numbers used across the analysis scripts.
+# The per-pincode helpers only select what they need (argpartition) instead
+# of sorting every pincode; the per-group profile covers every month and
+# district in one vectorized pass.
+
+
+def _top_positions(values, k):
+    """
+    Positions of the k largest values, largest first.
+    Same result as Series.nlargest(k, keep='first'), without a full sort.
+    """
+    n = len(values)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k == n:
+        candidates = np.arange(n)
+    else:
+        # kth largest value: everything above it is in, ties fill the rest in order
+        kth = np.partition(values, n - k)[n - k]
+        above = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)[:k - len(above)]
+        candidates = np.concatenate([above, ties])
+    # Sort only the k winners (value desc, then original position)
+    order = np.lexsort((candidates, -values[candidates]))
+    return candidates[order]
+
+
+def top_k(series, k):
+    """Top-k entries of a Series, largest first (drop-in for nlargest + sort)."""
+    return series.iloc[_top_positions(series.to_numpy(), k)]
+
+
+def pareto_head(series, k=20, cut=50):
+    """
+    Head of the Pareto curve for a Series of totals (e.g. load per pincode).
+
+    Returns (head, k_at_cut):
+      head     -> DataFrame of the top-k rows with 'cumulative_percentage'
+      k_at_cut -> how many of the busiest entries carry `cut`% of the total
+    Only the entries needed are ever sorted: the selection window doubles
+    until it covers the cut.
+    """
+    values = series.to_numpy()
+    total = values.sum()
+    window = max(k, 1)
+    while True:
+        positions = _top_positions(values, window)
+        cumulative = np.cumsum(values[positions]) / total * 100 if total else np.zeros(len(positions))
+        reached = np.flatnonzero(cumulative >= cut)
+        if len(reached) or window >= len(values):
+            break
+        window *= 2
+
+    k_at_cut = int(reached[0]) + 1 if len(reached) else len(values)
+    head = series.iloc[positions[:k]].rename_axis(series.index.name).reset_index()
+    head['cumulative_percentage'] = cumulative[:k]
+    return head, k_at_cut
+
+
+def concentration_profile(df, group_cols, key_col, value_col, k=10, cuts=(50, 80)):
+    """
+    Concentration stats for every group (e.g. every month x district) at once.
+
+    Per group: number of keys, total, top-k share, keys needed for each cut
+    (k_50, k_80, ...), Gini coefficient and Herfindahl-Hirschman index (HHI).
+    """
+    group_cols = list(group_cols)
+    totals = df.groupby(group_cols + [key_col], observed=True)[value_col].sum().reset_index()
+    group_id = totals.groupby(group_cols, observed=True).ngroup().to_numpy()
+    values = totals[value_col].to_numpy(dtype=np.float64)
+
+    # One sort for all groups: by group, then busiest first
+    order = np.lexsort((-values, group_id))
+    gid = group_id[order]
+    x = values[order]
+    n_groups = int(gid.max()) + 1 if len(gid) else 0
+
+    counts = np.bincount(gid, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    sums = np.bincount(gid, weights=x, minlength=n_groups)
+    rank = np.arange(len(x)) - starts[gid] + 1                    # 1 = busiest
+    cum = np.cumsum(x)
+    running = cum - np.repeat(cum[starts] - x[starts], counts)     # cumsum within each group
+    safe_sums = np.where(sums > 0, sums, 1)
+    share = running / safe_sums[gid]
+
+    first_row = np.unique(group_id, return_index=True)[1]
+    profile = totals.iloc[first_row][group_cols].reset_index(drop=True)
+    profile['n_keys'] = counts
+    profile['total'] = sums
+    profile[f'top_{k}_share'] = np.bincount(gid, weights=np.where(rank <= k, x, 0), minlength=n_groups) / safe_sums * 100
+    for cut in cuts:
+        # keys strictly below the cut, plus the one that crosses it
+        below = np.bincount(gid, weights=(share < cut / 100 - 1e-12), minlength=n_groups)
+        profile[f'k_{cut}'] = np.minimum(below + 1, counts).astype(np.int64)
+
+    # Gini from the descending ranks: sum(i * x_i) over ascending i = (n+1)*sum - sum(rank * x)
+    weighted = np.bincount(gid, weights=rank * x, minlength=n_groups)
+    ascending_weighted = (counts + 1) * sums - weighted
+    profile['gini'] = np.where(sums > 0, 2 * ascending_weighted / (counts * safe_sums) - (counts + 1) / counts, 0.0)
+    profile['hhi'] = np.bincount(gid, weights=(x / safe_sums[gid]) ** 2, minlength=n_groups)
+    return profile
+
+
+# ==========================================
+# 🚀 DEMO
+# ==========================================
+if __name__ == "__main__":
+    df = pd.read_csv('../../data/processed/cleaned_monthly_enrollment_data.csv')
+    df['pincode'] = df['pincode'].astype(str)
+
+    totals = df.groupby('pincode')['total_enrollments'].sum()
+    head, k50 = pareto_head(totals, k=20, cut=50)
+    print(head.head(10))
+    print(f"\n{k50} of {len(totals)} pincodes carry 50% of all enrollments.")
+
+    print("\n--- Concentration by Month & District ---")
+    print(concentration_profile(df, ['month_year', 'district'], 'pincode', 'total_enrollments'))
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 📈 CORRELATION & REGRESSION FROM SUMS
+# ==========================================
+# Pearson r, the OLS line and its confidence band only need six running
+# totals per group: n, Σx, Σy, Σx², Σy², Σxy. These are computed in one
+# vectorized pass, can be added together chunk by chunk (streaming), and
+# replace regplot's bootstrap over every raw row.
+
+Z_95 = 1.959964  # normal quantile for a 95% interval (n is large here)
+
+
+def sufficient_stats(df, x, y, by=None):
+    """Running totals for x/y, one row per group (or a single row if by=None)."""
+    xv = df[x].to_numpy(dtype=np.float64)
+    yv = df[y].to_numpy(dtype=np.float64)
+    parts = pd.DataFrame({
+        'n': 1.0, 'sx': xv, 'sy': yv,
+        'sxx': xv * xv, 'syy': yv * yv, 'sxy': xv * yv,
+    }, index=df.index)
+    if by is None:
+        return parts.sum().to_frame().T
+    keys = [df[col] for col in ([by] if isinstance(by, str) else by)]
+    return parts.groupby(keys, observed=True).sum()
+
+
+def merge_stats(*stats):
+    """Combines totals from several chunks/partitions (groups are aligned by index)."""
+    merged = stats[0]
+    for other in stats[1:]:
+        merged = merged.add(other, fill_value=0)
+    return merged
+
+
+def rank_stats(df, x, y, by=None):
+    """Totals over within-group ranks, so fit_stats(...)['pearson_r'] is Spearman's rho."""
+    if by is None:
+        ranked = pd.DataFrame({x: df[x].rank(), y: df[y].rank()})
+    else:
+        keys = [by] if isinstance(by, str) else list(by)
+        grouped = df.groupby(keys, observed=True)
+        ranked = df[keys].copy()
+        ranked[x] = grouped[x].rank()
+        ranked[y] = grouped[y].rank()
+    return sufficient_stats(ranked, x, y, by)
+
+
+def fit_stats(stats, z=Z_95):
+    """
+    Pearson r (with Fisher-z interval) and the OLS fit y = intercept + slope*x
+    (with slope standard error and interval) for every row of totals.
+    """
+    n = stats['n'].to_numpy()
+    mean_x = stats['sx'].to_numpy() / n
+    mean_y = stats['sy'].to_numpy() / n
+    sxx = stats['sxx'].to_numpy() - n * mean_x ** 2   # centred sums of squares
+    syy = stats['syy'].to_numpy() - n * mean_y ** 2
+    sxy = stats['sxy'].to_numpy() - n * mean_x * mean_y
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = sxy / np.sqrt(sxx * syy)
+        slope = sxy / sxx
+        intercept = mean_y - slope * mean_x
+        # Residual variance of the fitted line
+        sse = np.clip(syy - slope * sxy, 0, None)
+        sigma2 = sse / (n - 2)
+        slope_se = np.sqrt(sigma2 / sxx)
+        # Fisher transform gives a well-behaved interval for r
+        fisher = np.arctanh(np.clip(r, -0.999999, 0.999999))
+        fisher_se = 1 / np.sqrt(n - 3)
+
+    return pd.DataFrame({
+        'n': n.astype(np.int64),
+        'pearson_r': r,
+        'r_low': np.tanh(fisher - z * fisher_se),
+        'r_high': np.tanh(fisher + z * fisher_se),
+        'slope': slope,
+        'intercept': intercept,
+        'slope_se': slope_se,
+        'slope_low': slope - z * slope_se,
+        'slope_high': slope + z * slope_se,
+        'mean_x': mean_x,
+        'sxx': sxx,
+        'sigma2': sigma2,
+    }, index=stats.index)
+
+
+def confidence_band(fit, xs, z=Z_95):
+    """Fitted line and its confidence band for the mean response at xs."""
+    xs = np.asarray(xs, dtype=np.float64)
+    y_hat = fit['intercept'] + fit['slope'] * xs
+    half = z * np.sqrt(fit['sigma2'] * (1 / fit['n'] + (xs - fit['mean_x']) ** 2 / fit['sxx']))
+    return y_hat, y_hat - half, y_hat + half
+
+
+def plot_fit(ax, df, x, y, fit, color='#005a8d', line_color='#f37021', gridsize=40):
+    """Density (hexbin) of the points plus the precomputed OLS line and band."""
+    xv = df[x].to_numpy()
+    yv = df[y].to_numpy()
+    ax.hexbin(xv, yv, gridsize=gridsize, mincnt=1, bins='log',
+              cmap=_single_hue_cmap(color))
+    xs = np.linspace(xv.min(), xv.max(), 100)
+    y_hat, low, high = confidence_band(fit, xs)
+    ax.plot(xs, y_hat, color=line_color, lw=3)
+    ax.fill_between(xs, low, high, color=line_color, alpha=0.2)
+
+
+def _single_hue_cmap(color):
+    """Light-to-solid ramp of one colour, so sparse bins stay visible."""
+    from matplotlib.colors import LinearSegmentedColormap, to_rgba
+    return LinearSegmentedColormap.from_list('density', [to_rgba(color, 0.3), to_rgba(color, 1.0)])
+
+
+# ==========================================
+# 🚀 DEMO
+# ==========================================
+if __name__ == "__main__":
+    df = pd.read_csv('../../data/processed/cleaned_monthly_enrollment_data.csv')
+
+    overall = fit_stats(sufficient_stats(df, 'age_0_5', 'age_5_17')).iloc[0]
+    print(f"Overall: r = {overall['pearson_r']:.3f} "
+          f"[{overall['r_low']:.3f}, {overall['r_high']:.3f}], "
+          f"slope = {overall['slope']:.3f} ± {Z_95 * overall['slope_se']:.3f}")
+    print(f"Spearman rho = {fit_stats(rank_stats(df, 'age_0_5', 'age_5_17')).iloc[0]['pearson_r']:.3f}")
+
+    print("\n--- Sibling Effect by Month ---")
+    by_month = fit_stats(sufficient_stats(df, 'age_0_5', 'age_5_17', by='month_year'))
+    print(by_month[['n', 'pearson_r', 'slope', 'intercept']])
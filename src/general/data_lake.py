@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+from schema import SCHEMAS, read_source
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+LAKE_ROOT = '../../data/lake'
+MANIFEST = '_manifest.json'
+
+# ==========================================
+# 🏞️ PARTITIONED RAW DATA LAKE
+# ==========================================
+# Raw rows are landed once as
+#     data/lake/<source>/year=YYYY/month=MM/state=<State>/part.npz
+# Each partition is a compressed columnar file (one array per column).
+# Per-partition min/max statistics live in <source>/_manifest.json, so a
+# loader can skip every partition that cannot match its date/region filter
+# without opening it.
+
+
+def _partition_dir(source, year, month, state, root):
+    return os.path.join(root, source, f"year={year:04d}", f"month={month:02d}", f"state={state}")
+
+
+def _write_partition(path, part, counts):
+    os.makedirs(path, exist_ok=True)
+    districts, district_codes = np.unique(part['district'].astype(str).to_numpy(), return_inverse=True)
+    columns = {
+        'date': part['date'].to_numpy().astype('datetime64[D]'),
+        'pincode': part['pincode'].to_numpy(dtype=np.int32),
+        'district_code': district_codes.astype(np.int32),
+        'district_values': districts.astype(str),
+        **{col: part[col].to_numpy(dtype=np.int32) for col in counts},
+    }
+    tmp = os.path.join(path, 'part.tmp.npz')
+    np.savez_compressed(tmp, **columns)
+    os.replace(tmp, os.path.join(path, 'part.npz'))
+
+    return {
+        'rows': int(len(part)),
+        'min_date': str(columns['date'].min()),
+        'max_date': str(columns['date'].max()),
+        'min_pincode': int(columns['pincode'].min()),
+        'max_pincode': int(columns['pincode'].max()),
+        'districts': districts.tolist(),
+        **{f'max_{col}': int(columns[col].max()) for col in counts},
+    }
+
+
+def _read_partition(path, state, counts, columns=None):
+    with np.load(os.path.join(path, 'part.npz')) as data:
+        frame = {
+            'date': data['date'].astype('datetime64[ns]'),
+            'state': np.full(len(data['pincode']), state, dtype=object),
+            'district': data['district_values'][data['district_code']],
+            'pincode': data['pincode'],
+        }
+        for col in counts:
+            frame[col] = data[col]
+    df = pd.DataFrame(frame)
+    return df if columns is None else df[columns]
+
+
+def load_manifest(source, root=LAKE_ROOT):
+    path = os.path.join(root, source, MANIFEST)
+    if not os.path.exists(path):
+        return {'source': source, 'partitions': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_manifest(source, manifest, root):
+    path = os.path.join(root, source, MANIFEST)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+# ==========================================
+# 📥 INGESTION
+# ==========================================
+def ingest(source, df=None, root=LAKE_ROOT, mode='overwrite'):
+    """
+    Lands rows of one source into year/month/state partitions.
+    mode='overwrite' replaces the partitions the rows fall into;
+    mode='append' adds the rows to whatever those partitions already hold.
+    Returns the number of partitions written.
+    """
+    if df is None:
+        df = read_source(source)
+    counts = SCHEMAS[source]['counts']
+    manifest = load_manifest(source, root)
+
+    keys = [df['date'].dt.year.rename('year'), df['date'].dt.month.rename('month'), df['state'].astype(str)]
+    written = 0
+    for (year, month, state), part in df.groupby(keys, observed=True, sort=True):
+        path = _partition_dir(source, year, month, state, root)
+        name = os.path.relpath(path, os.path.join(root, source))
+        if mode == 'append' and name in manifest['partitions']:
+            part = pd.concat([_read_partition(path, state, counts), part], ignore_index=True)
+        stats = _write_partition(path, part, counts)
+        manifest['partitions'][name] = {'year': int(year), 'month': int(month), 'state': state, **stats}
+        written += 1
+
+    manifest['version'] = int(time.time() * 1000)   # bumped on every write (used for cache invalidation)
+    _save_manifest(source, manifest, root)
+    return written
+
+
+# ==========================================
+# 📤 PRUNED LOADER
+# ==========================================
+def prune(source, start=None, end=None, states=None, districts=None, pincodes=None, root=LAKE_ROOT):
+    """Partitions whose statistics can overlap the filters, without opening any file."""
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    states = set(states) if states is not None else None
+    districts = set(districts) if districts is not None else None
+    pins = sorted(int(p) for p in pincodes) if pincodes is not None else None
+
+    selected = []
+    for name, stats in sorted(load_manifest(source, root)['partitions'].items()):
+        if start is not None and pd.Timestamp(stats['max_date']) < start:
+            continue
+        if end is not None and pd.Timestamp(stats['min_date']) > end:
+            continue
+        if states is not None and stats['state'] not in states:
+            continue
+        if districts is not None and not districts.intersection(stats['districts']):
+            continue
+        if pins is not None:
+            i = np.searchsorted(pins, stats['min_pincode'])
+            if i == len(pins) or pins[i] > stats['max_pincode']:
+                continue
+        selected.append((name, stats))
+    return selected
+
+
+def read_lake(source, start=None, end=None, states=None, districts=None, pincodes=None,
+              columns=None, root=LAKE_ROOT):
+    """
+    Loads only the partitions that match the date/region filters, then applies
+    the filters row by row. Output matches read_source(): same columns, with
+    state and district as categoricals.
+    """
+    counts = SCHEMAS[source]['counts']
+    parts = [
+        _read_partition(os.path.join(root, source, name), stats['state'], counts)
+        for name, stats in prune(source, start, end, states, districts, pincodes, root)
+    ]
+    if not parts:
+        df = pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in
+                           [('date', 'datetime64[ns]'), ('state', object), ('district', object),
+                            ('pincode', np.int32)] + [(c, np.int32) for c in counts]})
+    else:
+        df = pd.concat(parts, ignore_index=True)
+
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= (df['date'] >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (df['date'] <= pd.Timestamp(end)).to_numpy()
+    if states is not None:
+        mask &= df['state'].isin(list(states)).to_numpy()
+    if districts is not None:
+        mask &= df['district'].isin(list(districts)).to_numpy()
+    if pincodes is not None:
+        mask &= df['pincode'].isin([int(p) for p in pincodes]).to_numpy()
+    df = df[mask].reset_index(drop=True)
+
+    df['state'] = df['state'].astype('category')
+    df['district'] = df['district'].astype('category')
+    return df if columns is None else df[columns]
+
+
+# ==========================================
+# 🚀 INGEST ALL SOURCES + PRUNING DEMO
+# ==========================================
+if __name__ == "__main__":
+    for source in SCHEMAS:
+        n = ingest(source)
+        print(f"✅ {source:<12} landed into {n} partitions")
+
+    # preprocess.py's check only needs March and November 2025
+    total = len(load_manifest('demographic')['partitions'])
+    t0 = time.perf_counter()
+    mar = read_lake('demographic', start='2025-03-01', end='2025-03-31')
+    nov = read_lake('demographic', start='2025-11-01', end='2025-11-30')
+    elapsed = time.perf_counter() - t0
+    picked = len(prune('demographic', '2025-03-01', '2025-03-31')) + len(prune('demographic', '2025-11-01', '2025-11-30'))
+
+    print(f"\n📂 Read {picked} of {total} demographic partitions in {elapsed * 1000:.1f} ms")
+    print(f"March 2025 Total (17+): {mar['demo_age_above_17'].sum()}")
+    print(f"Nov 2025 Total (17+):   {nov['demo_age_above_17'].sum()}")
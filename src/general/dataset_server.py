@@ -0,0 +1,273 @@
+import os
+import sys
+import json
+import time
+import signal
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory, resource_tracker
+from schema import SCHEMAS, read_source
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+REGISTRY_PATH = os.environ.get('UIDAI_DATASET_REGISTRY',
+                               os.path.join(tempfile.gettempdir(), 'uidai_datasets.json'))
+
+# Raw sources (through the schema) and the processed monthly tables
+DATASETS = {
+    **{name: {'path': schema['path']} for name, schema in SCHEMAS.items()},
+    'enrolment_monthly': {'path': '../../data/processed/cleaned_monthly_enrollment_data.csv'},
+    'biometric_monthly': {'path': '../../data/processed/cleaned_monthly_biometric_data.csv'},
+}
+
+# ==========================================
+# 🧠 SHARED-MEMORY DATASET SERVER
+# ==========================================
+# The server loads each dataset once and copies every column into its own
+# shared-memory block: numeric/datetime columns as they are, text and
+# categorical columns as integer codes (the category labels are small and
+# go into the registry). The registry is a JSON file naming, per dataset and
+# version, the blocks and dtypes. Any Python process on the host can attach
+# and get read-only NumPy views straight onto those blocks: no CSV parsing,
+# no copy per analyst.
+
+
+def _version(path):
+    st = os.stat(path)
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def _block_name(name, version, column):
+    # Short and filesystem-safe (macOS limits shm names to ~30 characters)
+    digest = hashlib.sha1(f"{name}:{version}:{column}".encode()).hexdigest()[:16]
+    return f"uidai_{digest}"
+
+
+_owned = set()   # blocks created by this process (the server keeps their registration)
+
+
+def _open_block(block):
+    """Attaches to an existing block without letting this process's tracker unlink it at exit."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=block, track=False)
+    shm = shared_memory.SharedMemory(name=block)
+    # Before 3.13 every attach registers the block, and the tracker would
+    # destroy it when this (client) process exits.
+    if block not in _owned:
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def _columns(df):
+    """(column, array to share, registry entry) for each DataFrame column."""
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or not (
+                pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_dtype(series)):
+            codes, labels = pd.factorize(series.astype(str) if not isinstance(series.dtype, pd.CategoricalDtype)
+                                         else series, sort=True)
+            dtype = np.int16 if len(labels) < 2**15 else np.int32
+            yield col, codes.astype(dtype), {'kind': 'category', 'categories': [str(v) for v in labels]}
+        else:
+            yield col, series.to_numpy(), {'kind': 'array'}
+
+
+def _read_registry(path=REGISTRY_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_registry(registry, path=REGISTRY_PATH):
+    tmp = path + f'.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(registry, f, indent=1)
+    os.replace(tmp, path)
+
+
+class DatasetServer:
+    """Owns the shared blocks; they live until unpublish()/shutdown()."""
+
+    def __init__(self, registry_path=REGISTRY_PATH):
+        self.registry_path = registry_path
+        self.blocks = {}    # (name, version) -> [SharedMemory]
+
+    def publish(self, name, df, version):
+        """Copies df into shared memory once and registers it under name/version."""
+        key = (name, version)
+        if key in self.blocks:
+            return
+        entry = {'version': version, 'rows': len(df), 'columns': []}
+        blocks = []
+        try:
+            for col, values, meta in _columns(df):
+                values = np.ascontiguousarray(values)
+                block = _block_name(name, version, col)
+                shm = shared_memory.SharedMemory(name=block, create=True, size=max(values.nbytes, 1))
+                blocks.append(shm)
+                _owned.add(block)
+                np.ndarray(values.shape, values.dtype, buffer=shm.buf)[:] = values
+                entry['columns'].append({'name': col, 'block': block, 'dtype': values.dtype.str, **meta})
+        except BaseException:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+            raise
+        self.blocks[key] = blocks
+
+        registry = _read_registry(self.registry_path)
+        registry.setdefault(name, {})[version] = entry
+        registry[name]['latest'] = version
+        _write_registry(registry, self.registry_path)
+
+    def unpublish(self, name, version):
+        for shm in self.blocks.pop((name, version), []):
+            shm.close()
+            shm.unlink()
+            _owned.discard(shm.name)
+        registry = _read_registry(self.registry_path)
+        versions = registry.get(name, {})
+        versions.pop(version, None)
+        if versions.get('latest') == version:
+            remaining = [v for v in versions if v != 'latest']
+            if remaining:
+                versions['latest'] = remaining[-1]
+            else:
+                registry.pop(name, None)
+        _write_registry(registry, self.registry_path)
+
+    def shutdown(self):
+        for name, version in list(self.blocks):
+            self.unpublish(name, version)
+
+    def refresh(self):
+        """(Re)loads every dataset whose source file changed since it was published."""
+        published = []
+        for name, spec in DATASETS.items():
+            if not os.path.exists(spec['path']):
+                continue
+            version = _version(spec['path'])
+            if (name, version) in self.blocks:
+                continue
+            df = read_source(name) if name in SCHEMAS else pd.read_csv(spec['path'])
+            stale = [v for n, v in self.blocks if n == name]
+            self.publish(name, df, version)
+            for old in stale:
+                self.unpublish(name, old)   # attached clients keep their mapping
+            published.append(name)
+        return published
+
+
+# ==========================================
+# 🔌 CLIENT SIDE
+# ==========================================
+class SharedDataset:
+    """Read-only, zero-copy view of a published dataset."""
+
+    def __init__(self, name, entry):
+        self.name = name
+        self.version = entry['version']
+        self.rows = entry['rows']
+        self.columns = entry['columns']
+        self._blocks = []
+        self.arrays = {}
+        for col in self.columns:
+            shm = _open_block(col['block'])
+            self._blocks.append(shm)
+            view = np.ndarray((self.rows,), np.dtype(col['dtype']), buffer=shm.buf)
+            view.flags.writeable = False
+            self.arrays[col['name']] = view
+
+    def __getitem__(self, column):
+        return self.arrays[column]
+
+    def frame(self):
+        """DataFrame over the shared arrays (text columns come back as categoricals)."""
+        data = {}
+        for col in self.columns:
+            values = self.arrays[col['name']]
+            if col['kind'] == 'category':
+                data[col['name']] = pd.Categorical.from_codes(values, col['categories'])
+            else:
+                data[col['name']] = values
+        return pd.DataFrame(data, copy=False)
+
+    def close(self):
+        """Unmaps the blocks; frames built with frame() must be dropped first."""
+        _attached.pop((self.name, self.version), None)
+        self.arrays = {}
+        for shm in self._blocks:
+            shm.close()
+        self._blocks = []
+
+
+def available(registry_path=REGISTRY_PATH):
+    """{dataset name: [versions]} currently served on this host."""
+    return {name: [v for v in versions if v != 'latest']
+            for name, versions in _read_registry(registry_path).items()}
+
+
+# Attached datasets stay mapped for the life of the process: frames built
+# on them point straight into the blocks.
+_attached = {}
+
+
+def attach(name, version=None, registry_path=REGISTRY_PATH):
+    """
+    Attaches to a dataset published by the server (latest version by default).
+    Raises KeyError if the server does not hold it.
+    """
+    versions = _read_registry(registry_path).get(name)
+    if not versions:
+        raise KeyError(f"Dataset '{name}' is not published; start dataset_server.py first")
+    version = version or versions['latest']
+    if version not in versions:
+        raise KeyError(f"Dataset '{name}' has no version '{version}' (have {list(versions)})")
+    if (name, version) not in _attached:
+        _attached[(name, version)] = SharedDataset(name, versions[version])
+    return _attached[(name, version)]
+
+
+def load(name, **read_kwargs):
+    """Shared view if the server has this dataset, otherwise a normal read."""
+    try:
+        return attach(name).frame()
+    except (KeyError, FileNotFoundError):
+        path = DATASETS[name]['path']
+        return read_source(name, path) if name in SCHEMAS else pd.read_csv(path, **read_kwargs)
+
+
+# ==========================================
+# 🚀 SERVE UNTIL CTRL-C
+# ==========================================
+if __name__ == "__main__":
+    server = DatasetServer()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        t0 = time.perf_counter()
+        for name in server.refresh():
+            size = sum(shm.size for (n, _), blocks in server.blocks.items() if n == name for shm in blocks)
+            print(f"✅ Published '{name}' ({size / 1024:.1f} KB)")
+        print(f"📡 {len(server.blocks)} datasets in shared memory in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        print(f"   Registry: {server.registry_path}")
+        print("   Attach from any process: from dataset_server import attach; attach('biometric').frame()")
+
+        t0 = time.perf_counter()
+        view = attach('biometric')
+        rows = len(view.frame())
+        print(f"⚡ Attach + frame: {(time.perf_counter() - t0) * 1000:.2f} ms for {rows} rows")
+        view.close()
+
+        while True:
+            time.sleep(30)
+            for name in server.refresh():
+                print(f"🔄 Republished '{name}' (source file changed)")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print("🛑 Shared blocks released.")
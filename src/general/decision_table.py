@@ -0,0 +1,158 @@
+import zlib
+import array
+import random
+import bisect
+import itertools
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 🗂️ COMPILED DECISION TABLES
+# ==========================================
+# Kiosk decisions depend on a handful of discrete inputs (pincode x age group
+# x family-size bucket). Instead of re-running the branch logic per visitor,
+# we evaluate it once for every combination, intern the distinct result
+# dicts, and keep a flat integer array of record ids. Pincodes and axis
+# values map straight to offsets, so a decision is a few dict hits, one
+# addition and one array index.
+
+UNKNOWN_PINCODE = ''   # row 0 holds the answer for pincodes not in the table
+
+
+class WeightedChoice:
+    """A decision with several valid outcomes picked in proportion to weights."""
+
+    def __init__(self, options):
+        weights, records = zip(*options)
+        self.records = records
+        self.cumulative = list(itertools.accumulate(weights))
+
+    def pick(self):
+        return self.records[bisect.bisect_right(self.cumulative, random.random() * self.cumulative[-1])]
+
+
+def content_hash(*frames):
+    """
+    32-bit hash of the index and values of Series/DataFrames (None allowed),
+    for fingerprints: inputs that change without moving a threshold still
+    invalidate the table.
+    """
+    crc = 0
+    for frame in frames:
+        data = b'' if frame is None else pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes()
+        crc = zlib.crc32(data + b'|', crc)
+    return crc
+
+
+class DecisionTable:
+    """
+    Precomputed answers of `decide(pincode, *axis_values)` for every pincode
+    and every combination of the given axis values.
+    """
+
+    def __init__(self, rows, axes, codes, records, fingerprint):
+        self.codes = codes              # record id per (row, *axis indices)
+        self.records = records          # interned, read-only result records
+        self.fingerprint = fingerprint  # thresholds/sets the table was built from
+
+        # Pre-multiplied offsets into the flattened codes: no index arithmetic per call
+        strides = [s // codes.itemsize for s in codes.strides]
+        self.rows = {pin: row * strides[0] for pin, row in rows.items()}
+        self.axes = [{value: i * stride for value, i in axis.items()}
+                     for axis, stride in zip(axes, strides[1:])]
+        self.flat = array.array(codes.dtype.char, codes.tobytes())
+        self.lookup = self._build_lookup()
+
+    @classmethod
+    def compile(cls, pincodes, axes, decide, fingerprint=None):
+        rows = {UNKNOWN_PINCODE: 0}
+        for pin in pincodes:
+            rows.setdefault(str(pin).strip(), len(rows))
+
+        interned = {}
+        records = []
+        shape = (len(rows),) + tuple(len(values) for values in axes)
+        codes = np.empty(shape, dtype=np.uint32)
+
+        for pin, row in rows.items():
+            for idx in itertools.product(*(range(len(values)) for values in axes)):
+                result = decide(pin, *(values[i] for values, i in zip(axes, idx)))
+                key = _freeze(result)
+                if key not in interned:
+                    interned[key] = len(records)
+                    records.append(_read_only(result))
+                codes[(row,) + idx] = interned[key]
+
+        # Narrowest integer type that can hold every record id
+        dtype = np.uint8 if len(records) <= 2**8 else np.uint16 if len(records) <= 2**16 else np.uint32
+        axis_index = [{value: i for i, value in enumerate(values)} for values in axes]
+        return cls(rows, axis_index, codes.astype(dtype), tuple(records), fingerprint)
+
+    def is_current(self, fingerprint):
+        """True if the table was built from these thresholds (no rebuild needed)."""
+        return self.fingerprint == fingerprint
+
+    def _build_lookup(self):
+        """
+        lookup(pincode, *axis_values) -> the precomputed decision.
+        Raises KeyError for axis values that were not compiled.
+
+        Specialised per number of axes with everything bound as locals,
+        so the per-call cost is a dict hit per input and one array index.
+        """
+        rows_get, flat, records = self.rows.get, self.flat, self.records
+
+        def row_offset(pincode):
+            offset = rows_get(pincode)
+            if offset is None:
+                offset = rows_get(str(pincode).strip(), 0)
+            return offset
+
+        if len(self.axes) == 0:
+            def lookup(pincode):
+                offset = rows_get(pincode)
+                if offset is None:
+                    offset = row_offset(pincode)
+                return records[flat[offset]]
+        elif len(self.axes) == 2:
+            first, second = self.axes
+
+            def lookup(pincode, a, b):
+                offset = rows_get(pincode)
+                if offset is None:
+                    offset = row_offset(pincode)
+                return records[flat[offset + first[a] + second[b]]]
+        else:
+            axes = self.axes
+
+            def lookup(pincode, *axis_values):
+                offset = row_offset(pincode)
+                for axis, value in zip(axes, axis_values):
+                    offset += axis[value]
+                return records[flat[offset]]
+
+        if any(isinstance(r, WeightedChoice) for r in records):
+            plain = lookup
+
+            def lookup(pincode, *axis_values):
+                record = plain(pincode, *axis_values)
+                return record.pick() if isinstance(record, WeightedChoice) else record
+        return lookup
+
+    def __len__(self):
+        return len(self.rows) - 1
+
+
+def _freeze(result):
+    """Hashable form of a decision, used to intern identical records."""
+    if isinstance(result, WeightedChoice):
+        return ('choice', tuple(result.cumulative), tuple(_freeze(r) for r in result.records))
+    return tuple(sorted(result.items()))
+
+
+def _read_only(result):
+    if isinstance(result, WeightedChoice):
+        result.records = tuple(_read_only(r) for r in result.records)
+        return result
+    return MappingProxyType(dict(result))
@@ -1,19 +1,19 @@
-import pandas as pd
+from schema import read_source
 
 # ---------------------------------------------------------
 # 1. LOAD DATA
 # ---------------------------------------------------------
 # Replace with the actual filename of your enrollment dataset
+# read_source checks the header/values and loads with explicit dtypes
 file_path = '../../data/raw/enrolment.csv'
-df = pd.read_csv(file_path)
+df = read_source('enrolment', file_path)
 
 print(f"Original Rows: {len(df)}")
 
 # ---------------------------------------------------------
 # 2. PRE-PROCESSING
 # ---------------------------------------------------------
-# A. Convert 'date'
-df['date'] = pd.to_datetime(df['date'], dayfirst=True)
+# A. 'date' is already parsed by read_source (DD-MM-YYYY)
 
 # B. Convert 'pincode' to string
 df['pincode'] = df['pincode'].astype(str)
@@ -0,0 +1,185 @@
+import time
+import numpy as np
+import pandas as pd
+from schema import SCHEMAS, read_source
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+RATES_PATH = '../../data/processed/daily_rates_{source}.npz'
+
+VOLATILITY_WINDOW = 28    # Observed days the daily indicators look back over
+TS_ALPHA = 0.3            # EWMA smoothing of the one-day-ahead forecast
+TS_LIMIT = 4              # |tracking signal| above this = forecast is biased
+
+# ==========================================
+# 📏 FREQUENCY-MISMATCH NORMALIZER
+# ==========================================
+# Early months arrive as one row per pincode dated the 1st (a monthly sum);
+# later months arrive as daily counts. Instead of collapsing everything to
+# months, each month's grain is detected once and every row becomes a
+# per-day rate:
+#   monthly sum -> spread evenly over the days of that month
+#   daily count -> kept on its day (pincodes with no row that day = 0)
+# A month counts as monthly sums only if its single report day is the 1st
+# and later months exist (a rolling extract that stops on the 1st is daily
+# data, not a sum). Days outside what a source reported (missing months, the
+# part of a month before daily reporting started, anything after the last
+# reported date) are marked unobserved rather than zero.
+
+
+class DailyRates:
+    """(column x pincode x day) float32 rates plus the day/grain metadata."""
+
+    def __init__(self, columns, pincodes, days, rates, observed, months, monthly):
+        self.columns = list(columns)
+        self.pincodes = np.asarray(pincodes).astype(str)
+        self.days = np.asarray(days, dtype='datetime64[D]')
+        self.rates = rates                # float32 (column, pincode, day)
+        self.observed = observed          # bool (day,)
+        self.months = np.asarray(months, dtype='datetime64[M]')
+        self.monthly = monthly            # bool (month,): True = monthly sums were spread
+
+    def grains(self):
+        return pd.DataFrame({'month': self.months.astype(str),
+                             'grain': np.where(self.monthly, 'monthly', 'daily')})
+
+    def total(self, columns=None, observed_only=True):
+        """(pincode x day) sum of the given columns, optionally only observed days."""
+        idx = [self.columns.index(c) for c in (columns or self.columns)]
+        total = self.rates[idx].sum(axis=0)
+        return total[:, self.observed] if observed_only else total
+
+    def save(self, path):
+        np.savez_compressed(path, columns=np.array(self.columns), pincodes=self.pincodes,
+                            days=self.days, rates=self.rates, observed=self.observed,
+                            months=self.months, monthly=self.monthly)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['columns'].tolist(), data['pincodes'], data['days'], data['rates'],
+                       data['observed'], data['months'], data['monthly'])
+
+
+def detect_grain(dates):
+    """
+    Per calendar month: reporting days, first/last reported day and whether the
+    month holds monthly sums (one report, on the 1st, in a month the extract
+    has moved past). One pass over the distinct reported days.
+    """
+    report_days = np.unique(np.asarray(dates, dtype='datetime64[D]'))
+    day_months = report_days.astype('datetime64[M]')
+    months, starts, counts = np.unique(day_months, return_index=True, return_counts=True)
+    first_day = report_days[starts]
+    return {
+        'months': months,
+        'report_days': counts,
+        'first_day': first_day,
+        'last_day': report_days[starts + counts - 1],
+        'monthly': (counts == 1) & (first_day == months.astype('datetime64[D]')) & (months < months[-1]),
+    }
+
+
+def normalize(df, columns):
+    """Raw rows (date, pincode, count columns) -> DailyRates for every pincode."""
+    dates = df['date'].to_numpy().astype('datetime64[D]')
+    grain = detect_grain(dates)
+    months = grain['months']
+
+    days = np.arange(months[0].astype('datetime64[D]'), (months[-1] + 1).astype('datetime64[D]'))
+    day_month = np.searchsorted(months, days.astype('datetime64[M]'))
+    day_month = np.clip(day_month, 0, len(months) - 1)
+    reported_month = months[day_month] == days.astype('datetime64[M]')
+    observed = reported_month & (days <= grain['last_day'][-1]) & (grain['monthly'][day_month] | (
+        (days >= grain['first_day'][day_month]) & (days <= grain['last_day'][day_month])))
+
+    pin_codes, pincodes = pd.factorize(df['pincode'].astype(str), sort=True)
+    values = df[columns].to_numpy(dtype=np.float64).T                  # (column, row)
+    row_month = np.searchsorted(months, dates.astype('datetime64[M]'))
+    row_monthly = grain['monthly'][row_month]
+
+    rates = np.zeros((len(columns), len(pincodes), len(days)))
+    # Daily rows land on their own day
+    daily = ~row_monthly
+    day_idx = (dates[daily] - days[0]).astype(np.int64)
+    for c in range(len(columns)):
+        np.add.at(rates[c], (pin_codes[daily], day_idx), values[c, daily])
+
+    # Monthly rows: sum per (pincode, month), then spread over that month's days
+    sums = np.zeros((len(columns), len(pincodes), len(months)))
+    for c in range(len(columns)):
+        np.add.at(sums[c], (pin_codes[row_monthly], row_month[row_monthly]), values[c, row_monthly])
+    month_len = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+    spread = reported_month & grain['monthly'][day_month]
+    rates[:, :, spread] += sums[:, :, day_month[spread]] / month_len[day_month[spread]]
+
+    return DailyRates(columns, pincodes, days, rates.astype(np.float32), observed, months, grain['monthly'])
+
+
+# ==========================================
+# 📉 DAILY INDICATORS (over observed days)
+# ==========================================
+def volatility(series, window=VOLATILITY_WINDOW):
+    """Coefficient of variation of each pincode's last `window` daily rates."""
+    recent = series[:, -window:]
+    mean = recent.mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(mean > 0, recent.std(axis=1) / mean, 0.0)
+
+
+def tracking_signal(series, alpha=TS_ALPHA, window=VOLATILITY_WINDOW):
+    """
+    Running sum of one-day-ahead EWMA errors / mean absolute error over the
+    last `window` days. Persistently one-sided errors (a trend the forecast is
+    missing) push it beyond +/-TS_LIMIT.
+    """
+    errors = np.empty_like(series)
+    level = series[:, 0].copy()
+    for t in range(series.shape[1]):
+        errors[:, t] = series[:, t] - level
+        level += alpha * errors[:, t]
+    recent = errors[:, -window:]
+    mad = np.abs(recent).mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(mad > 0, recent.sum(axis=1) / mad, 0.0)
+
+
+def indicators(rates, columns=None, window=VOLATILITY_WINDOW):
+    """Per-pincode mean daily rate, volatility and tracking signal."""
+    series = rates.total(columns).astype(np.float64)
+    ts = tracking_signal(series, window=window)
+    return pd.DataFrame({
+        'pincode': rates.pincodes,
+        'mean_daily_rate': series[:, -window:].mean(axis=1).round(2),
+        'volatility': volatility(series, window).round(3),
+        'tracking_signal': ts.round(2),
+        'biased': np.abs(ts) > TS_LIMIT,
+    })
+
+
+def build_rates(source, df=None):
+    """Normalizes one source (raw rows via the schema unless given) and saves the arrays."""
+    if df is None:
+        df = read_source(source)
+    rates = normalize(df, SCHEMAS[source]['counts'])
+    rates.save(RATES_PATH.format(source=source))
+    return rates
+
+
+# ==========================================
+# 🚀 NORMALIZE ALL SOURCES
+# ==========================================
+if __name__ == "__main__":
+    for source in SCHEMAS:
+        t0 = time.perf_counter()
+        rates = build_rates(source)
+        elapsed = time.perf_counter() - t0
+        grains = rates.grains()['grain'].value_counts().to_dict()
+        print(f"✅ {source:<12} {len(rates.pincodes)} pincodes x {rates.observed.sum()} observed days "
+              f"({grains}) in {elapsed * 1000:.1f} ms")
+
+    table = indicators(DailyRates.load(RATES_PATH.format(source='demographic')))
+    print("\n--- Most Volatile Demographic-Update Centers (last 28 observed days) ---")
+    print(table.sort_values('volatility', ascending=False).head(5).to_string(index=False))
+    print(f"\n🚩 {table['biased'].sum()} centers with a biased forecast (|tracking signal| > {TS_LIMIT})")
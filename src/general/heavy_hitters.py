@@ -0,0 +1,211 @@
+import time
+import numpy as np
+import pandas as pd
+from schema import SCHEMAS, read_source
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+TOP_K = 10
+CAPACITY = 64        # Space-Saving counters kept per (band, month)
+CMS_WIDTH = 512      # Count-Min columns (error <= 2/width of the stream total, w.h.p.)
+CMS_DEPTH = 4        # Count-Min rows (failure probability ~ 0.5**depth)
+PRIME = 2**31 - 1    # hash modulus; pincode * a stays inside int64
+
+# ==========================================
+# 📈 STREAMING HEAVY HITTERS
+# ==========================================
+# "Busiest center" and top-10 bottleneck lists without regrouping the full
+# history: every (age band, month) keeps a Space-Saving summary (at most
+# CAPACITY counters) plus a Count-Min sketch (fixed CMS_DEPTH x CMS_WIDTH
+# array). Rows are consumed in batches as they arrive. Both structures are
+# mergeable, so worker partitions summarise their own rows and the results
+# are merged into one live list.
+
+
+class CountMinSketch:
+    """Fixed-size frequency sketch; estimates never undercount."""
+
+    def __init__(self, width=CMS_WIDTH, depth=CMS_DEPTH, seed=0):
+        rng = np.random.default_rng(seed)
+        self.width, self.depth, self.seed = width, depth, seed
+        self.a = rng.integers(1, PRIME, size=(depth, 1), dtype=np.int64)
+        self.b = rng.integers(0, PRIME, size=(depth, 1), dtype=np.int64)
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _columns(self, keys):
+        # Pincodes are < 2**20, so a * key < 2**51: no overflow
+        return (self.a * np.asarray(keys, dtype=np.int64)[None, :] + self.b) % PRIME % self.width
+
+    def add(self, keys, counts):
+        cols = self._columns(keys)
+        for row in range(self.depth):
+            np.add.at(self.table[row], cols[row], counts)
+
+    def estimate(self, keys):
+        cols = self._columns(keys)
+        return self.table[np.arange(self.depth)[:, None], cols].min(axis=0)
+
+    def merge(self, other):
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Only sketches built with the same width/depth/seed can be merged")
+        self.table += other.table
+        return self
+
+
+class SpaceSaving:
+    """
+    Weighted Space-Saving: at most `capacity` counters. A key's true count
+    lies in [count - error, count]; any key heavier than total/capacity is
+    guaranteed to be held.
+    """
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.counts = {}    # key -> overestimated count
+        self.errors = {}    # key -> maximum overestimate
+        self.total = 0
+
+    def add(self, keys, counts):
+        """Batch update; the batch is pre-aggregated so each key is touched once."""
+        keys, inverse = np.unique(np.asarray(keys), return_inverse=True)
+        weights = np.bincount(inverse, weights=counts).astype(np.int64)
+        self.total += int(weights.sum())
+        # Heaviest first: light keys are the ones that should be evicted
+        for i in np.argsort(-weights, kind='stable'):
+            key, weight = keys[i].item(), int(weights[i])
+            if weight <= 0:
+                continue
+            if key in self.counts:
+                self.counts[key] += weight
+            elif len(self.counts) < self.capacity:
+                self.counts[key] = weight
+                self.errors[key] = 0
+            else:
+                victim = min(self.counts, key=self.counts.get)
+                floor = self.counts.pop(victim)
+                del self.errors[victim]
+                self.counts[key] = floor + weight
+                self.errors[key] = floor
+
+    def _floor(self):
+        """Count any key missing from a full summary could still have."""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def merge(self, other):
+        """Mergeable-summary combine: missing keys are charged the other side's floor."""
+        floor_self, floor_other = self._floor(), other._floor()
+        counts, errors = {}, {}
+        for key in self.counts.keys() | other.counts.keys():
+            counts[key] = self.counts.get(key, floor_self) + other.counts.get(key, floor_other)
+            errors[key] = self.errors.get(key, floor_self) + other.errors.get(key, floor_other)
+        keep = sorted(counts, key=counts.get, reverse=True)[:self.capacity]
+        self.counts = {key: counts[key] for key in keep}
+        self.errors = {key: errors[key] for key in keep}
+        self.total += other.total
+        return self
+
+    def top(self, k):
+        return sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
+
+
+class HeavyHitters:
+    """Approximate top-k pincodes per age band and month, fed by raw rows."""
+
+    def __init__(self, capacity=CAPACITY, width=CMS_WIDTH, depth=CMS_DEPTH, seed=0):
+        self.capacity, self.width, self.depth, self.seed = capacity, width, depth, seed
+        self.summaries = {}   # (band, 'YYYY-MM') -> (SpaceSaving, CountMinSketch)
+
+    def _summary(self, band, month):
+        key = (band, month)
+        if key not in self.summaries:
+            self.summaries[key] = (SpaceSaving(self.capacity),
+                                   CountMinSketch(self.width, self.depth, self.seed))
+        return self.summaries[key]
+
+    def consume(self, rows, bands=None):
+        """
+        Adds a batch of raw rows (date, pincode and count columns, as read by
+        schema.read_source). `bands` defaults to every count column present.
+        """
+        if bands is None:
+            known = {col for schema in SCHEMAS.values() for col in schema['counts']}
+            bands = [col for col in rows.columns if col in known]
+        months, month_codes = np.unique(rows['date'].dt.strftime('%Y-%m').to_numpy(), return_inverse=True)
+        pincodes = rows['pincode'].to_numpy(dtype=np.int64)
+        for m, month in enumerate(months):
+            in_month = month_codes == m
+            keys = pincodes[in_month]
+            for band in bands:
+                counts = rows[band].to_numpy(dtype=np.int64)[in_month]
+                space_saving, sketch = self._summary(band, month)
+                space_saving.add(keys, counts)
+                sketch.add(keys, counts)
+        return self
+
+    def merge(self, other):
+        """Folds another partition's summaries into this one."""
+        for key, (space_saving, sketch) in other.summaries.items():
+            mine = self._summary(*key)
+            mine[0].merge(space_saving)
+            mine[1].merge(sketch)
+        return self
+
+    def top(self, band, month=None, k=TOP_K):
+        """
+        Current top-k for a band, in one month or (month=None) across all
+        months seen. Each row carries the estimate and a guaranteed lower bound.
+        """
+        parts = [s for (b, m), s in self.summaries.items() if b == band and (month is None or m == month)]
+        if not parts:
+            return pd.DataFrame(columns=['pincode', 'estimate', 'lower_bound'])
+        space_saving = SpaceSaving(self.capacity)
+        sketch = CountMinSketch(self.width, self.depth, self.seed)
+        for ss, cms in parts:
+            space_saving.merge(ss)
+            sketch.merge(cms)
+
+        candidates = space_saving.top(max(k * 2, k + 5))
+        keys = np.array([key for key, _ in candidates], dtype=np.int64)
+        upper = np.minimum([count for _, count in candidates], sketch.estimate(keys))
+        lower = np.array([count - space_saving.errors[key] for key, count in candidates])
+        table = pd.DataFrame({'pincode': keys.astype(str), 'estimate': upper, 'lower_bound': lower})
+        return table.sort_values(['estimate', 'pincode'], ascending=[False, True]).head(k).reset_index(drop=True)
+
+    def memory_cells(self):
+        """Counters + sketch cells held, independent of the number of rows seen."""
+        return sum(len(ss.counts) * 2 + cms.table.size for ss, cms in self.summaries.values())
+
+
+# ==========================================
+# 🚀 STREAMING DEMO: 4 PARTITIONS, MERGED
+# ==========================================
+if __name__ == "__main__":
+    bio = read_source('biometric').sort_values('date', kind='stable').reset_index(drop=True)
+    workers = 4
+    chunk = 500
+
+    t0 = time.perf_counter()
+    partitions = [HeavyHitters() for _ in range(workers)]
+    owner = bio['pincode'].to_numpy() % workers           # rows routed by pincode
+    for start in range(0, len(bio), chunk):              # rows arrive in date order
+        batch = bio.iloc[start:start + chunk]
+        for w in range(workers):
+            part = batch[owner[start:start + chunk] == w]
+            if len(part):
+                partitions[w].consume(part)
+    live = partitions[0]
+    for part in partitions[1:]:
+        live.merge(part)
+    elapsed = time.perf_counter() - t0
+    print(f"✅ Streamed {len(bio)} rows in {len(bio) // chunk + 1} batches x {workers} partitions "
+          f"in {elapsed * 1000:.0f} ms ({live.memory_cells()} cells held)")
+
+    latest = bio['date'].max().strftime('%Y-%m')
+    for band in SCHEMAS['biometric']['counts']:
+        approx = live.top(band)
+        exact = bio.groupby('pincode')[band].sum().nlargest(TOP_K)
+        hits = len(set(approx['pincode']) & set(exact.index.astype(str)))
+        print(f"\n--- Current Bottlenecks: {band} (all months) - {hits}/{TOP_K} match exact top-{TOP_K} ---")
+        print(approx.head(5).to_string(index=False))
+        print(f"   {latest}: busiest center {live.top(band, latest, k=1)['pincode'].iloc[0]}")
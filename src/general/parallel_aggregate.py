@@ -0,0 +1,216 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+import multiprocessing as mp
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+# Below this many rows the process pool costs more than it saves,
+# so we aggregate in the calling process instead.
+MIN_ROWS_PER_WORKER = 50_000
+
+# Large prime used to mix the partition key codes before the modulo
+HASH_MULTIPLIER = 1_000_003
+
+# Set in the parent just before the pool forks: the frame being grouped and
+# its rows in partition order. Forked workers see both as copy-on-write
+# shared pages, so no row is pickled or copied to reach them.
+_shared = {}
+
+
+# ==========================================
+# 🧠 PARTITION WORKER
+# ==========================================
+def _aggregate_rows(frame, rows, keys, values):
+    """
+    Sums one partition (`rows` of the frame, or all of it when rows is None).
+    Key columns are coded here, in the worker, with sorted codes: the partial
+    aggregate comes back as (group key codes, key uniques, sums) - tiny
+    compared to the rows.
+    """
+    def column(col):
+        series = frame[col]
+        array = series.array if pd.api.types.is_extension_array_dtype(series.dtype) else series.to_numpy()
+        return array if rows is None else array.take(rows)
+
+    codes, uniques = [], []
+    for col in keys:
+        col_codes, col_uniques = pd.factorize(column(col), sort=True)
+        codes.append(col_codes)
+        uniques.append(col_uniques)
+    radix = tuple(max(len(u), 1) for u in uniques)
+
+    # Mixed-radix encoding turns the composite key into a single int64
+    group_id = np.ravel_multi_index(codes, radix)
+    uniq, inverse = np.unique(group_id, return_inverse=True)
+    sums = np.zeros((len(uniq), len(values)), dtype=np.int64)
+    for j, col in enumerate(values):
+        weights = np.asarray(column(col), dtype=np.int64)
+        sums[:, j] = np.bincount(inverse, weights=weights, minlength=len(uniq))
+    return np.unravel_index(uniq, radix), uniques, sums
+
+
+def _aggregate_slice(start, stop, keys, values):
+    """Pool task: aggregates rows start:stop of the partition-ordered row index."""
+    return _aggregate_rows(_shared['frame'], _shared['rows'][start:stop], keys, values)
+
+
+def _merge_partials(partials, n_keys, n_values):
+    """
+    Maps every partition's local key codes onto one sorted global coding and
+    sums groups that appear in several partitions (possible when the
+    partition keys are not group keys). Works on group-sized arrays only.
+    Sorted codes make the sorted group ids come out in key order.
+    """
+    global_codes, global_uniques = [], []
+    for j in range(n_keys):
+        local = [pd.Series(p[1][j]) for p in partials]
+        to_global, uniques = pd.factorize(pd.concat(local, ignore_index=True), sort=True)
+        offsets = np.cumsum([0] + [len(u) for u in local])
+        global_codes.append(np.concatenate(
+            [to_global[offsets[i]:offsets[i + 1]][p[0][j]] for i, p in enumerate(partials)]
+        ))
+        global_uniques.append(uniques)
+    radix = tuple(max(len(u), 1) for u in global_uniques)
+
+    ids = np.ravel_multi_index(global_codes, radix)
+    sums = np.concatenate([p[2] for p in partials]).reshape(-1, n_values)
+    uniq, inverse = np.unique(ids, return_inverse=True)
+    if len(uniq) == len(ids):
+        order = np.argsort(ids)
+        ids, sums = ids[order], sums[order]
+    else:
+        merged = np.zeros((len(uniq), n_values), dtype=np.int64)
+        np.add.at(merged, inverse, sums)
+        ids, sums = uniq, merged
+    return np.unravel_index(ids, radix), global_uniques, sums
+
+
+# ==========================================
+# 🚀 PUBLIC ENTRY POINT
+# ==========================================
+def _hash_key(series):
+    """Integer key per row for hash partitioning, without factorizing the column."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(dtype=np.int64)
+    if isinstance(series.dtype, pd.PeriodDtype):
+        return series.array.asi8
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.to_numpy(dtype=np.int64)
+    return pd.util.hash_array(series.to_numpy()).view(np.int64)
+
+
+def partition_rows(df, partition_keys, n_partitions, method='hash'):
+    """
+    Assigns each row a partition number from its partition key columns.
+    'hash'  -> mixes the keys and takes a modulo (spreads big states around)
+    'range' -> contiguous key ranges holding roughly equal row counts
+    """
+    if method == 'hash':
+        mixed = np.zeros(len(df), dtype=np.int64)
+        for col in partition_keys:
+            mixed = mixed * HASH_MULTIPLIER + _hash_key(df[col])
+        return (mixed % n_partitions).astype(np.int16)
+
+    if method == 'range':
+        codes, radix = [], []
+        for col in partition_keys:
+            col_codes, uniques = pd.factorize(df[col], sort=True)
+            codes.append(col_codes)
+            radix.append(max(len(uniques), 1))
+        key = np.ravel_multi_index(codes, radix)
+        counts = np.bincount(key)
+        # Cut the key space where the running row count crosses each 1/n mark
+        cuts = np.searchsorted(np.cumsum(counts), np.arange(1, n_partitions) * len(df) / n_partitions)
+        return np.searchsorted(cuts, key, side='right').astype(np.int16)
+
+    raise ValueError(f"Unknown partition method: {method!r}")
+
+
+def partitioned_groupby_sum(df, keys, values, partition_keys=('state', 'district'),
+                            workers=None, method='hash'):
+    """
+    Drop-in for df.groupby(keys)[values].sum().reset_index() that splits the rows
+    by state/district and sums each partition in a separate process.
+
+    The parent only assigns partitions and orders the row index; key coding
+    and summing happen in the workers, and only the per-partition aggregates
+    travel back. Needs the 'fork' start method (workers read the frame they
+    inherit); where it is missing the aggregation runs in this process.
+    """
+    keys = list(keys)
+    values = list(values)
+    workers = workers or os.cpu_count() or 1
+
+    partition_keys = [col for col in partition_keys if col in keys]
+    if not partition_keys:
+        raise ValueError("partition_keys must overlap with the group keys")
+
+    n_partitions = max(1, min(workers, len(df) // MIN_ROWS_PER_WORKER))
+    if 'fork' not in mp.get_all_start_methods():
+        # A spawned worker would re-run the calling script on import
+        n_partitions = 1
+
+    if n_partitions == 1:
+        partials = [_aggregate_rows(df, None, keys, values)]
+    else:
+        # 1. Partition and order the row index so each partition is one contiguous slice
+        part = partition_rows(df, partition_keys, n_partitions, method)
+        # int16 partition ids let numpy use a stable radix sort, so this stays O(n)
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(part, minlength=n_partitions))])
+        _shared['frame'] = df
+        _shared['rows'] = np.argsort(part, kind='stable')
+
+        # 2. Aggregate every partition in its own process
+        try:
+            with mp.get_context('fork').Pool(n_partitions) as pool:
+                partials = pool.starmap(
+                    _aggregate_slice,
+                    [(bounds[i], bounds[i + 1], keys, values) for i in range(n_partitions)]
+                )
+        finally:
+            _shared.clear()
+
+    # 3. Merge, then decode group codes back into the original key values
+    key_codes, uniques, sums = _merge_partials(partials, len(keys), len(values))
+    result = pd.DataFrame({col: uniques[j].take(key_codes[j]) for j, col in enumerate(keys)})
+    for j, col in enumerate(values):
+        result[col] = sums[:, j]
+    # Already in key order (sorted codes), like pandas groupby output
+    return result
+
+
+# ==========================================
+# 📊 BENCHMARK (synthetic national extract)
+# ==========================================
+if __name__ == "__main__":
+    rows = 10_000_000
+    rng = np.random.default_rng(7)
+    print(f"🔄 Generating synthetic national extract ({rows:,} rows)...")
+    state_code = rng.integers(0, 36, rows)
+    synthetic = pd.DataFrame({
+        'month_year': pd.PeriodIndex.from_ordinals(rng.integers(0, 12, rows) + 663, freq='M'),
+        'state': pd.Categorical.from_codes(state_code, [f"State_{i}" for i in range(36)]),
+        'district': state_code * 25 + rng.integers(0, 25, rows),
+        'pincode': 110000 + rng.integers(0, 19000, rows),
+        'age_0_5': rng.integers(0, 50, rows),
+        'age_5_17': rng.integers(0, 50, rows),
+    })
+    keys = ['month_year', 'state', 'district', 'pincode']
+    cols = ['age_0_5', 'age_5_17']
+
+    t0 = time.perf_counter()
+    expected = synthetic.groupby(keys, observed=True)[cols].sum().reset_index()
+    baseline = time.perf_counter() - t0
+    print(f"pandas groupby (1 core): {baseline:.2f}s")
+
+    for n in (2, 4, 8, 16, 32, 64):
+        if n > (os.cpu_count() or 1):
+            break
+        t0 = time.perf_counter()
+        got = partitioned_groupby_sum(synthetic, keys, cols, workers=n)
+        elapsed = time.perf_counter() - t0
+        same = np.array_equal(got[cols].to_numpy(), expected[cols].to_numpy())
+        print(f"partitioned ({n:>2} workers): {elapsed:.2f}s  speedup x{baseline / elapsed:.1f}  match={same}")
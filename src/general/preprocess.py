@@ -1,12 +1,20 @@
-import pandas as pd
+import os
 import matplotlib.pyplot as plt
+from parallel_aggregate import partitioned_groupby_sum
+from schema import read_source
+from frequency_normalizer import build_rates, RATES_PATH
+
+# Set UIDAI_WORKERS > 1 to run the monthly aggregation on a process pool
+# (rows are partitioned by state/district, one partition per worker).
+WORKERS = int(os.environ.get('UIDAI_WORKERS', '1'))
 
 # ---------------------------------------------------------
 # 1. LOAD DATA
 # ---------------------------------------------------------
 # Replace with your actual file path
+# read_source checks the header/values and loads with explicit dtypes
 file_path = '../../data/raw/demographics.csv'
-df = pd.read_csv(file_path)
+df = read_source('demographic', file_path)
 
 print("--- Original Data Info ---")
 print(df.info())
@@ -15,17 +23,13 @@ print(df.info())
 # 2. PRE-PROCESSING (CLEANING & TRANSFORMATION)
 # ---------------------------------------------------------
 
-# A. Convert 'date' from String to Datetime objects
-# This allows Python to understand time (months, days, years)
-df['date'] = pd.to_datetime(df['date'], dayfirst=True)
+# A. 'date' is already parsed to Datetime by read_source (DD-MM-YYYY)
+# and 'demo_age_17_' is renamed to 'demo_age_above_17' by the schema.
 
 # B. Convert 'pincode' from Integer to String
 # Pincodes are categories, not numbers we do math on.
 df['pincode'] = df['pincode'].astype(str)
 
-# C. Rename messy column names for better readability
-df.rename(columns={'demo_age_17_': 'demo_age_above_17'}, inplace=True)
-
 # ---------------------------------------------------------
 # 3. SOLVING THE "FREQUENCY MISMATCH"
 # ---------------------------------------------------------
@@ -34,10 +38,24 @@ df.rename(columns={'demo_age_17_': 'demo_age_above_17'}, inplace=True)
 
 df['month_year'] = df['date'].dt.to_period('M')
 
+# Monthly totals below are kept for the existing reports. Daily resolution
+# is preserved separately: each month's grain is detected, monthly sums are
+# spread over their days, and the per-day rates are saved as compact arrays
+# for daily indicators (volatility, tracking signal).
+rates = build_rates('demographic', df)
+print("\n--- Detected Reporting Grain per Month ---")
+print(rates.grains().to_string(index=False))
+print(f"Saved per-day rates to '{RATES_PATH.format(source='demographic')}'")
+
 # Group by Month and District/State to get consistent totals
-monthly_df = df.groupby(['month_year', 'state', 'district'])[[
-    'demo_age_5_17', 'demo_age_above_17'
-]].sum().reset_index()
+if WORKERS > 1:
+    monthly_df = partitioned_groupby_sum(df, ['month_year', 'state', 'district'], [
+        'demo_age_5_17', 'demo_age_above_17'
+    ], workers=WORKERS)
+else:
+    monthly_df = df.groupby(['month_year', 'state', 'district'])[[
+        'demo_age_5_17', 'demo_age_above_17'
+    ]].sum().reset_index()
 
 # Convert month_year back to timestamp for plotting compatibility
 monthly_df['plot_date'] = monthly_df['month_year'].dt.to_timestamp()
@@ -1,9 +1,11 @@
-import pandas as pd
+from schema import read_source
 
 # 1. Load Raw Data
 # Replace with your downloaded file name
+# read_source checks the header/values and loads with explicit dtypes.
+# Dates stay as text so the saved file keeps the raw DD-MM-YYYY format.
 file_path = '../../data/raw/Biometric.csv' 
-df = pd.read_csv(file_path)
+df = read_source('biometric', file_path, parse_dates=False)
 
 print(f"❌ Original Rows: {len(df)}")
 
@@ -13,8 +15,7 @@ print(f"✅ Cleaned Rows:  {len(df)}")
 print(f"   (Removed {12353 - len(df)} duplicate entries)")
 
 # 3. STANDARDIZE COLUMNS
-# Rename 'bio_age_17_' to something readable
-df.rename(columns={'bio_age_17_': 'bio_age_above_17'}, inplace=True)
+# 'bio_age_17_' is already renamed to 'bio_age_above_17' by the schema
 
 # 4. SAVE CLEAN FILE
 output_filename = '../../data/processed/cleaned_monthly_biometric_data.csv'
@@ -0,0 +1,254 @@
+import os
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from concentration import top_k
+from schema import SCHEMAS, read_source
+from data_lake import LAKE_ROOT, MANIFEST, read_lake
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+CACHE_MAX_BYTES = 64 * 1024**2   # results kept in memory across queries
+CACHE_MAX_ENTRIES = 256
+
+LEVELS = ('month', 'state', 'district', 'pincode')
+
+# Tables of the processed store the query layer can slice
+SOURCES = {
+    'enrolment': {
+        'path': '../../data/processed/cleaned_monthly_enrollment_data.csv',
+        'time_col': 'month_year', 'time_format': '%Y-%m',
+        'measures': ['age_0_5', 'age_5_17', 'age_18_greater'],
+    },
+    'biometric': {
+        'path': '../../data/processed/cleaned_monthly_biometric_data.csv',
+        'time_col': 'date', 'time_format': '%d-%m-%Y',
+        'measures': ['bio_age_5_17', 'bio_age_above_17'],
+    },
+    # No pincode-level processed file: served from the raw data lake (or raw CSV)
+    'demographic': {
+        'lake': 'demographic',
+        'measures': ['demo_age_5_17', 'demo_age_above_17'],
+    },
+}
+
+
+# ==========================================
+# 🗃️ SIZE-BOUNDED LRU RESULT CACHE
+# ==========================================
+class ResultCache:
+    """
+    Least-recently-used cache of query results, bounded by entry count and
+    by the memory the cached frames take. Every entry remembers the data
+    version it was computed from; a lookup under a newer version is a miss.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, max_entries=CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()     # key -> (version, frame, nbytes)
+        self.nbytes = 0
+        self.hits = self.misses = 0
+
+    def get(self, key, version):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != version:
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, version, frame):
+        nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes:
+            return
+        if key in self.entries:
+            self._drop(key)
+        self.entries[key] = (version, frame, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes or len(self.entries) > self.max_entries:
+            self._drop(next(iter(self.entries)))
+
+    def invalidate(self, source=None):
+        """Drops every entry (or those of one source)."""
+        for key in [k for k in self.entries if source is None or k[0] == source]:
+            self._drop(key)
+
+    def _drop(self, key):
+        self.nbytes -= self.entries.pop(key)[2]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# ==========================================
+# 📦 BASE TABLES + DATA VERSION
+# ==========================================
+def data_version(source):
+    """Changes whenever the data behind a source is rewritten."""
+    path = _backing_file(source)
+    st = os.stat(path)     # one stat per query, no file is read
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def _backing_file(source):
+    """The lake manifest (rewritten on every ingest), else the CSV itself."""
+    spec = SOURCES[source]
+    if 'lake' in spec:
+        manifest = os.path.join(LAKE_ROOT, spec['lake'], MANIFEST)
+        return manifest if os.path.exists(manifest) else SCHEMAS[spec['lake']]['path']
+    return spec['path']
+
+
+def _load_table(source):
+    """Source rows with the columns every query uses: month, state, district, pincode, measures."""
+    spec = SOURCES[source]
+    if 'lake' in spec:
+        if _backing_file(source).endswith(MANIFEST):
+            df = read_lake(spec['lake'])
+        else:
+            df = read_source(spec['lake'])
+        months = df['date']
+    else:
+        df = pd.read_csv(spec['path'], dtype={'state': 'category', 'district': 'category', 'pincode': np.int32})
+        months = pd.to_datetime(df[spec['time_col']], format=spec['time_format'])
+    table = pd.DataFrame({
+        'month': months.dt.to_period('M').dt.to_timestamp(),
+        'state': df['state'].astype('category'),
+        'district': df['district'].astype('category'),
+        'pincode': df['pincode'].astype(np.int32),
+    })
+    for col in spec['measures']:
+        table[col] = df[col].to_numpy(dtype=np.int64)
+    return table
+
+
+# ==========================================
+# 🔎 QUERY ENGINE
+# ==========================================
+def _as_tuple(values, cast):
+    if values is None:
+        return None
+    if isinstance(values, (str, int, np.integer)):
+        values = [values]
+    return tuple(sorted({cast(v) for v in values}))
+
+
+def _as_date(value):
+    return None if value is None else pd.Timestamp(value).isoformat()
+
+
+class QueryEngine:
+    """
+    Filter / group / aggregate over the processed store:
+
+        engine.query('enrolment', by='pincode', measures='age_0_5', top=10)
+        engine.query('biometric', by=['month', 'district'], start='2025-06')
+
+    Results are cached under the normalized query, so the same slice asked
+    in a different spelling (list vs tuple, unsorted pincodes, '2025-06' vs
+    '2025-06-01') is served from memory. Callers always get their own copy.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else ResultCache()
+        self.tables = {}   # source -> (version, base table)
+
+    def normalize(self, source, measures=None, by=(), start=None, end=None,
+                  states=None, districts=None, pincodes=None, top=None):
+        if source not in SOURCES:
+            raise KeyError(f"Unknown source '{source}', expected one of {list(SOURCES)}")
+        known = SOURCES[source]['measures']
+        measures = tuple(known) if measures is None else (measures,) if isinstance(measures, str) else tuple(measures)
+        by = (by,) if isinstance(by, str) else tuple(by or ())
+        for name, allowed, given in (('measure', known, measures), ('level', LEVELS, by)):
+            unknown = [g for g in given if g not in allowed]
+            if unknown:
+                raise KeyError(f"Unknown {name}(s) {unknown} for '{source}', expected {list(allowed)}")
+        return (source, measures, by, _as_date(start), _as_date(end),
+                _as_tuple(states, str), _as_tuple(districts, str), _as_tuple(pincodes, int),
+                None if top is None else int(top))
+
+    def _table(self, source, version):
+        cached = self.tables.get(source)
+        if cached is None or cached[0] != version:
+            cached = self.tables[source] = (version, _load_table(source))
+        return cached[1]
+
+    def query(self, source, measures=None, by=(), start=None, end=None,
+              states=None, districts=None, pincodes=None, top=None):
+        """
+        Sums `measures` over rows matching the time/region filters, grouped by
+        any of LEVELS (none = grand total). `top=k` keeps the k largest groups
+        by the first measure. Returns a DataFrame indexed by the group levels.
+        """
+        key = self.normalize(source, measures, by, start, end, states, districts, pincodes, top)
+        version = data_version(source)
+        result = self.cache.get(key, version)
+        if result is None:
+            result = self._compute(self._table(source, version), *key[1:])
+            self.cache.put(key, version, result)
+        return result.copy()
+
+    def _compute(self, table, measures, by, start, end, states, districts, pincodes, top):
+        mask = np.ones(len(table), dtype=bool)
+        if start is not None:
+            mask &= (table['month'] >= pd.Timestamp(start).to_period('M').to_timestamp()).to_numpy()
+        if end is not None:
+            mask &= (table['month'] <= pd.Timestamp(end)).to_numpy()
+        for col, wanted in (('state', states), ('district', districts), ('pincode', pincodes)):
+            if wanted is not None:
+                mask &= table[col].isin(wanted).to_numpy()
+        rows = table.loc[mask, list(by) + list(measures)]
+
+        if by:
+            result = rows.groupby(list(by), observed=True, sort=True)[list(measures)].sum()
+        else:
+            result = rows[list(measures)].sum().to_frame().T
+        if top is not None:
+            result = result.loc[top_k(result[measures[0]], top).index]
+        if 'pincode' in by:
+            # Pincodes are labels everywhere else in the repo
+            if isinstance(result.index, pd.MultiIndex):
+                level = by.index('pincode')
+                result.index = result.index.set_levels(result.index.levels[level].astype(str), level=level)
+            else:
+                result.index = result.index.astype(str)
+        return result
+
+
+# Module-level engine so scripts and notebooks share one cache
+_engine = QueryEngine()
+
+
+def query(source, measures=None, by=(), **filters):
+    """Shortcut for QueryEngine.query on the shared engine."""
+    return _engine.query(source, measures, by, **filters)
+
+
+# ==========================================
+# 🚀 DASHBOARD SLICES: COLD VS WARM
+# ==========================================
+if __name__ == "__main__":
+    slices = [
+        dict(source='enrolment', measures='age_0_5', by='pincode', top=10),
+        dict(source='enrolment', by='month'),
+        dict(source='biometric', by=['month', 'district']),
+        dict(source='biometric', by='pincode', start='2025-11', end='2025-12-31', top=10),
+    ]
+    for label in ('cold', 'warm'):
+        t0 = time.perf_counter()
+        results = [_engine.query(**s) for s in slices]
+        print(f"⏱️ {label}: {len(slices)} slices in {(time.perf_counter() - t0) * 1000:.2f} ms")
+
+    print(f"🗃️ Cache: {len(_engine.cache)} entries, {_engine.cache.nbytes / 1024:.1f} KB, "
+          f"{_engine.cache.hits} hits / {_engine.cache.misses} misses")
+    print("\n--- Top 10 Pincodes for Newborn Enrolments ---")
+    print(results[0])
+    print("\n--- Biometric Bottlenecks (Nov-Dec 2025) ---")
+    print(results[3])
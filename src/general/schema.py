@@ -0,0 +1,174 @@
+import time
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 📋 RAW SOURCE SCHEMAS
+# ==========================================
+# One entry per raw UIDAI extract. Columns map the canonical name we use in
+# the code to its dtype; 'aliases' lists the raw header spelling when it
+# differs (the "17+" columns end in a bare underscore in the raw files).
+COUNT_DTYPE = 'int32'
+KEY_DTYPES = {'state': 'category', 'district': 'category', 'pincode': 'int32'}
+DATE_FORMAT = '%d-%m-%Y'
+
+# Sanity limits checked on every load
+PINCODE_RANGE = (100000, 999999)
+MAX_DAILY_COUNT = 1_000_000
+
+SCHEMAS = {
+    'enrolment': {
+        'path': '../../data/raw/enrolment.csv',
+        'counts': ['age_0_5', 'age_5_17', 'age_18_greater'],
+        'aliases': {},
+    },
+    'demographic': {
+        'path': '../../data/raw/demographics.csv',
+        'counts': ['demo_age_5_17', 'demo_age_above_17'],
+        'aliases': {'demo_age_above_17': 'demo_age_17_'},
+    },
+    'biometric': {
+        'path': '../../data/raw/Biometric.csv',
+        'counts': ['bio_age_5_17', 'bio_age_above_17'],
+        'aliases': {'bio_age_above_17': 'bio_age_17_'},
+    },
+}
+
+
+class SchemaError(ValueError):
+    """Raised when a file does not match the schema of the source it claims to be."""
+
+
+def _engine():
+    """pyarrow's multithreaded CSV parser when installed, pandas' C parser otherwise."""
+    try:
+        import pyarrow  # noqa: F401
+        return 'pyarrow'
+    except ImportError:
+        return 'c'
+
+
+# ==========================================
+# 🔍 VALIDATION
+# ==========================================
+def check_header(name, path):
+    """
+    Reads only the header line and maps canonical names to the file's spelling.
+    Fails before any rows are parsed if a required column is missing.
+    """
+    schema = SCHEMAS[name]
+    with open(path, encoding='utf-8-sig') as f:
+        header = [col.strip() for col in f.readline().split(',')]
+
+    mapping = {}
+    for col in ['date', *KEY_DTYPES, *schema['counts']]:
+        if col in header:
+            mapping[col] = col
+        elif schema['aliases'].get(col) in header:
+            mapping[col] = schema['aliases'][col]
+        else:
+            raise SchemaError(
+                f"'{path}' is not a {name} file: missing column '{col}' (found {header})"
+            )
+    return mapping
+
+
+def check_values(name, df):
+    """Rejects nulls, negative/implausible counts and malformed pincodes."""
+    counts = SCHEMAS[name]['counts']
+    problems = []
+
+    # Plain NumPy on the column arrays: per-column pandas ops cost more than the checks
+    for col in ['state', 'district', 'pincode', *counts]:
+        n = int(np.count_nonzero(pd.isna(df[col].array)))
+        if n:
+            problems.append(f"{n} empty values in '{col}'")
+
+    low, high = PINCODE_RANGE
+    pins = df['pincode'].to_numpy()
+    n = int(np.count_nonzero((pins < low) | (pins > high)))
+    if n:
+        problems.append(f"{n} pincodes outside {low}-{high}")
+
+    for col in counts:
+        values = df[col].to_numpy()
+        n = int(np.count_nonzero((values < 0) | (values > MAX_DAILY_COUNT)))
+        if n:
+            problems.append(f"{n} values in '{col}' outside 0-{MAX_DAILY_COUNT}")
+
+    if problems:
+        raise SchemaError(f"{name} data failed validation: " + "; ".join(problems))
+
+
+# ==========================================
+# 🚀 FAST TYPED READER
+# ==========================================
+def read_source(name, path=None, parse_dates=True):
+    """
+    Loads a raw extract with explicit dtypes (int32 counts, categorical keys),
+    only the schema's columns, canonical column names and validated values.
+    """
+    if name not in SCHEMAS:
+        raise SchemaError(f"Unknown source '{name}'. Expected one of {list(SCHEMAS)}")
+    schema = SCHEMAS[name]
+    path = path or schema['path']
+
+    mapping = check_header(name, path)
+    dtypes = {'date': 'str', **KEY_DTYPES, **{col: COUNT_DTYPE for col in schema['counts']}}
+    # usecols costs more than parsing a spare column: only pass it if the file has extras
+    with open(path, encoding='utf-8-sig') as f:
+        n_columns = f.readline().count(',') + 1
+
+    try:
+        df = pd.read_csv(
+            path,
+            usecols=list(mapping.values()) if n_columns > len(mapping) else None,
+            dtype={mapping[col]: dtype for col, dtype in dtypes.items()},
+            engine=_engine(),
+        )
+    except (ValueError, TypeError) as err:
+        # Non-numeric text in a count/pincode column lands here
+        raise SchemaError(f"{name} data has values of the wrong type: {err}") from err
+
+    renames = {raw: col for col, raw in mapping.items() if raw != col}
+    if renames:
+        df = df.rename(columns=renames)
+    if list(df.columns) != list(mapping):
+        df = df[list(mapping)]
+    check_values(name, df)
+
+    if parse_dates:
+        try:
+            # An extract has a few hundred distinct dates: parse each once, then expand
+            codes, days = pd.factorize(df['date'])
+            df['date'] = pd.to_datetime(days, format=DATE_FORMAT).take(codes)
+        except ValueError as err:
+            raise SchemaError(f"{name} dates are not in DD-MM-YYYY format: {err}") from err
+    return df
+
+
+# ==========================================
+# 📊 DEMO: typed reader vs. plain read_csv
+# ==========================================
+if __name__ == "__main__":
+    def best_of(load, repeats=5):
+        """Fastest of a few runs, so one cold cache does not decide the comparison."""
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            result = load()
+            times.append(time.perf_counter() - t0)
+        return result, min(times)
+
+    def plain_read(path):
+        df = pd.read_csv(path)
+        df['date'] = pd.to_datetime(df['date'], dayfirst=True)
+        return df
+
+    for name, schema in SCHEMAS.items():
+        plain, plain_time = best_of(lambda: plain_read(schema['path']))
+        typed, typed_time = best_of(lambda: read_source(name))
+
+        print(f"{name:<12} rows={len(typed):>6}  "
+              f"read_csv: {plain_time * 1000:6.1f} ms / {plain.memory_usage(deep=True).sum() / 1e6:5.2f} MB  "
+              f"typed: {typed_time * 1000:6.1f} ms / {typed.memory_usage(deep=True).sum() / 1e6:5.2f} MB")
@@ -0,0 +1,209 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'biometric'))
+from schema import read_source
+from cohort_projection import load_projection
+from frequency_normalizer import DailyRates, RATES_PATH
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+FORECAST_PATH = '../../data/processed/pincode_load_forecast.csv'
+
+HISTORY_DAYS = 120      # Window of daily counts the models are fitted on
+BACKTEST_DAYS = 28      # Recent days used to pick the best model per pincode
+SEASON = 7              # Weekly cycle (weekends / weekday rush)
+
+EWMA_ALPHA = 0.3
+HW_ALPHA, HW_BETA, HW_GAMMA = 0.3, 0.05, 0.2
+
+
+# ==========================================
+# 🧱 DAILY LOAD MATRIX
+# ==========================================
+def build_daily_matrix(df, value_cols, history_days=HISTORY_DAYS):
+    """
+    Pivots raw rows into a dense (pincode x day) matrix of total transactions.
+    Days with no report count as zero load.
+    """
+    dates = df['date']
+    end = dates.max().normalize()
+    start = end - pd.Timedelta(days=history_days - 1)
+    recent = dates >= start
+
+    pin_codes, pincodes = pd.factorize(df.loc[recent, 'pincode'].astype(str))
+    day_index = (dates[recent] - start).dt.days.to_numpy()
+    load = df.loc[recent, value_cols].to_numpy(dtype=np.float64).sum(axis=1)
+
+    matrix = np.zeros((len(pincodes), history_days))
+    np.add.at(matrix, (pin_codes, day_index), load)
+    return pd.Index(pincodes, name='pincode'), pd.date_range(start, end), matrix
+
+
+def load_daily_matrix(value_cols, source='demographic', history_days=HISTORY_DAYS):
+    """
+    Same (pincodes, days, matrix) from the normalized per-day rates built by
+    frequency_normalizer.py, or None if they have not been built (or hold too
+    few daily-reported days). The weekly-seasonal models need consecutive
+    calendar days, so only the trailing run of days reported at daily grain
+    is used: it stops at the last gap in reporting and never reaches into
+    months whose monthly sums were spread flat over their days.
+    """
+    path = RATES_PATH.format(source=source)
+    if not os.path.exists(path):
+        return None
+    rates = DailyRates.load(path)
+    day_month = np.searchsorted(rates.months, rates.days.astype('datetime64[M]'))
+    daily = rates.observed & ~rates.monthly[np.clip(day_month, 0, len(rates.months) - 1)]
+    if not daily.any():
+        return None
+
+    end = np.flatnonzero(daily)[-1] + 1
+    gaps = np.flatnonzero(~daily[:end])
+    start = max(gaps[-1] + 1 if len(gaps) else 0, end - history_days)
+    if end - start < 2 * SEASON:
+        return None
+    matrix = rates.total(value_cols, observed_only=False)[:, start:end].astype(np.float64)
+    days = pd.DatetimeIndex(rates.days[start:end])
+    return pd.Index(rates.pincodes, name='pincode'), days, matrix
+
+
+# ==========================================
+# 🧠 VECTORIZED MODELS (all pincodes at once)
+# ==========================================
+# Each model returns (one-step-ahead in-sample predictions, next-day, next-week).
+
+def seasonal_naive(y, season=SEASON):
+    fitted = np.full_like(y, np.nan)
+    fitted[:, season:] = y[:, :-season]
+    next_day = y[:, -season]
+    next_week = y[:, -season:].sum(axis=1)
+    return fitted, next_day, next_week
+
+
+def ewma(y, alpha=EWMA_ALPHA):
+    fitted = np.empty_like(y)
+    level = y[:, 0].copy()
+    for t in range(y.shape[1]):
+        fitted[:, t] = level
+        level = alpha * y[:, t] + (1 - alpha) * level
+    return fitted, level, level * 7
+
+
+def holt_winters(y, season=SEASON, alpha=HW_ALPHA, beta=HW_BETA, gamma=HW_GAMMA):
+    """Additive Holt-Winters with a weekly season."""
+    n_pins, n_days = y.shape
+    level = y[:, :season].mean(axis=1)
+    trend = np.zeros(n_pins)
+    seasonal = y[:, :season] - level[:, None]
+    fitted = np.empty_like(y)
+
+    for t in range(n_days):
+        s = seasonal[:, t % season]
+        fitted[:, t] = level + trend + s
+        new_level = alpha * (y[:, t] - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        seasonal[:, t % season] = gamma * (y[:, t] - new_level) + (1 - gamma) * s
+        level = new_level
+
+    ahead = np.stack([level + h * trend + seasonal[:, (n_days + h - 1) % season]
+                      for h in range(1, 8)], axis=1)
+    ahead = np.clip(ahead, 0, None)
+    return fitted, ahead[:, 0], ahead.sum(axis=1)
+
+
+MODELS = {
+    'seasonal_naive': seasonal_naive,
+    'ewma': ewma,
+    'holt_winters': holt_winters,
+}
+
+
+def fit_forecasts(pincodes, matrix, backtest_days=BACKTEST_DAYS):
+    """
+    Fits every model on every pincode and keeps, per pincode, the one with the
+    lowest mean absolute error over the last `backtest_days` days.
+    """
+    names = list(MODELS)
+    results = [MODELS[name](matrix) for name in names]
+
+    actual = matrix[:, -backtest_days:]
+    mae = np.stack([np.nanmean(np.abs(fitted[:, -backtest_days:] - actual), axis=1)
+                    for fitted, _, _ in results], axis=1)
+    best = np.nanargmin(np.nan_to_num(mae, nan=np.inf), axis=1)
+    rows = np.arange(len(pincodes))
+
+    next_day = np.stack([r[1] for r in results], axis=1)[rows, best]
+    next_week = np.stack([r[2] for r in results], axis=1)[rows, best]
+    return pd.DataFrame({
+        'next_day': np.clip(next_day, 0, None).round(1),
+        'next_week': np.clip(next_week, 0, None).round(1),
+        'model': np.array(names)[best],
+        'mae': mae[rows, best].round(2),
+    }, index=pincodes)
+
+
+def load_forecast(path=FORECAST_PATH):
+    """Published forecast table indexed by pincode, or None if not built yet."""
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, dtype={'pincode': str}).set_index('pincode')
+
+
+def center_load(demo_df):
+    """
+    Per-pincode load used for routing decisions, busiest first, plus its unit.
+    Preferred: next-week forecast (tracks the Nov-Dec surge).
+    Fallback: the AVERAGE monthly volume (lags behind sudden surges).
+    Either way, mandatory biometric updates projected for the coming month
+    (cohort_projection.py) are added on top: those children queue at the same centers.
+    """
+    forecast = load_forecast()
+    if forecast is not None:
+        load, unit, share = forecast['next_week'], "users/wk forecast", 7 / 30.44
+    else:
+        df = demo_df.assign(
+            pincode=demo_df['pincode'].astype(str),
+            total_updates=demo_df['demo_age_5_17'] + demo_df['demo_age_above_17'],
+            month_year=demo_df['date'].dt.to_period('M'),
+        )
+        monthly = df.groupby(['pincode', 'month_year'])['total_updates'].sum()
+        load, unit, share = monthly.groupby('pincode').mean(), "users/month", 1.0
+
+    projection = load_projection()
+    if projection is not None:
+        next_month = projection.iloc[:, 0].reindex(load.index).fillna(0.0)
+        load = load + next_month * share
+    return load.sort_values(ascending=False), unit
+
+
+# ==========================================
+# 🚀 NIGHTLY REFIT
+# ==========================================
+if __name__ == "__main__":
+    print("🔄 Refitting per-pincode demand forecasts...")
+    t0 = time.perf_counter()
+
+    value_cols = ['demo_age_5_17', 'demo_age_above_17']
+    daily = load_daily_matrix(value_cols)
+    if daily is not None:
+        print(f"📏 Using normalized daily rates from '{RATES_PATH.format(source='demographic')}'")
+        pincodes, days, matrix = daily
+    else:
+        pincodes, days, matrix = build_daily_matrix(read_source('demographic'), value_cols)
+    forecast = fit_forecasts(pincodes, matrix)
+    forecast['forecast_from'] = (days[-1] + pd.Timedelta(days=1)).date()
+
+    forecast.reset_index().to_csv(FORECAST_PATH, index=False)
+    elapsed = time.perf_counter() - t0
+
+    print(f"✅ {len(forecast)} pincodes refitted in {elapsed:.2f}s "
+          f"(history {days[0].date()} → {days[-1].date()})")
+    print(f"📊 Models chosen: {forecast['model'].value_counts().to_dict()}")
+    print(forecast.sort_values('next_week', ascending=False).head(10))
+    print(f"\n🎉 Saved to '{FORECAST_PATH}'")
@@ -0,0 +1,260 @@
+import os
+import sys
+import mmap
+import time
+import array
+import bisect
+import random
+import struct
+
+# ==========================================
+# 📦 KIOSK SNAPSHOT (binary cold-start file)
+# ==========================================
+# Everything a kiosk needs to answer visitors, precomputed into one small
+# versioned file. The loader memory-maps it and reads arrays in place with
+# the standard library only: no pandas, no CSV parsing, no groupbys.
+#
+# Layout (native byte order, recorded in the header):
+#   header   : magic, version, byte order, flags, pincode count, build time
+#   sections : table of (offset, length) pairs, then the sections themselves
+#     PINCODES      uint32[n]     sorted, so lookups are a binary search
+#     LOADS         float32[n]    routing load per center
+#     THRESHOLDS    float64[4]    see THRESHOLD_NAMES
+#     HUBS / FRAUD / SCHOOLS      bitmaps, one bit per pincode
+#     ROUTING_ORDER uint32[n]     pincode indices, least-loaded first
+#     REDIRECT_PTR  uint32[n+1]   CSR offsets into the two arrays below
+#     REDIRECT_DST  uint32[m]     destination pincode index
+#     REDIRECT_SHR  float32[m]    share of the source's excess
+#     REDIRECT_FRAC float32[n]    fraction of a center's visitors the plan sends away
+
+SNAPSHOT_PATH = '../../data/processed/kiosk_snapshot.bin'
+
+MAGIC = b'UIDAIKS1'
+VERSION = 2
+HEADER = struct.Struct('<8sHBBIQ')      # magic, version, byte order, flags, n, built_at
+SECTION = struct.Struct('<QQ')          # offset, length in bytes
+SECTIONS = ['PINCODES', 'LOADS', 'THRESHOLDS', 'HUBS', 'FRAUD', 'SCHOOLS',
+            'ROUTING_ORDER', 'REDIRECT_PTR', 'REDIRECT_DST', 'REDIRECT_SHR', 'REDIRECT_FRAC']
+THRESHOLD_NAMES = ['stress', 'maternity', 'fraud', 'school_cluster']
+FLAG_FORECAST_LOADS = 1
+FLAG_REDIRECT_PLAN = 2          # a rebalancing plan was built (no entry = no spare capacity)
+
+# Same rules as the kiosk scripts
+MATERNITY_QUANTILE = 0.80       # enroll_solution.py: top 20% newborn volume
+FRAUD_QUANTILE = 0.95           # enroll_solution.py: top 5% adult volume
+STRESS_QUANTILE = 0.80          # smart_solution_for_demo_data.py: top 20% load
+SCHOOL_CLUSTER_THRESHOLD = 2000  # bio_solution.py: child updates per year
+PROJECTION_MONTHS = 12          # bio_solution.py: look-ahead for mandatory updates falling due
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is missing pieces or was written by another version."""
+
+
+# ==========================================
+# 📤 EXPORTER (build side, uses pandas)
+# ==========================================
+def _bitmap(flags):
+    bits = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def export_snapshot(path=SNAPSHOT_PATH):
+    """Computes the decision state from the processed data and writes the snapshot."""
+    import pandas as pd
+    from demand_forecast import center_load, load_forecast
+    from load_rebalancer import load_redirects
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'biometric'))
+    from schema import read_source
+    from cohort_projection import upcoming_mbu
+
+    demo = read_source('demographic')
+    enrol = pd.read_csv('../../data/processed/cleaned_monthly_enrollment_data.csv', dtype={'pincode': str})
+    bio = pd.read_csv('../../data/processed/cleaned_monthly_biometric_data.csv', dtype={'pincode': str})
+
+    loads, _ = center_load(demo)
+    newborn = enrol.groupby('pincode')['age_0_5'].sum()
+    adults = enrol.groupby('pincode')['age_18_greater'].sum()
+    children = bio.groupby('pincode')['bio_age_5_17'].sum()
+    # Same rule as deploy_unit: past child updates or updates about to fall due
+    projected = upcoming_mbu(PROJECTION_MONTHS)
+    if projected is not None:
+        children = children.combine(projected.round(), max, fill_value=0)
+    thresholds = [loads.quantile(STRESS_QUANTILE), newborn.quantile(MATERNITY_QUANTILE),
+                  adults.quantile(FRAUD_QUANTILE), SCHOOL_CLUSTER_THRESHOLD]
+
+    pincodes = sorted(set(loads.index) | set(newborn.index) | set(children.index), key=int)
+    position = {pin: i for i, pin in enumerate(pincodes)}
+    load_values = loads.reindex(pincodes).fillna(0.0).tolist()
+
+    plan = load_redirects()
+    redirects = plan or {}
+    ptr, dst, share, fraction = [0], [], [], []
+    for pin in pincodes:
+        pin_fraction, options = redirects.get(pin, (0.0, []))
+        for destination, weight in options:
+            dst.append(position[destination])
+            share.append(weight)
+        ptr.append(len(dst))
+        fraction.append(pin_fraction)
+
+    sections = {
+        'PINCODES': array.array('I', [int(p) for p in pincodes]).tobytes(),
+        'LOADS': array.array('f', load_values).tobytes(),
+        'THRESHOLDS': array.array('d', thresholds).tobytes(),
+        'HUBS': _bitmap([newborn.get(p, 0) > thresholds[1] for p in pincodes]),
+        'FRAUD': _bitmap([adults.get(p, 0) > thresholds[2] for p in pincodes]),
+        'SCHOOLS': _bitmap([children.get(p, 0) > thresholds[3] for p in pincodes]),
+        'ROUTING_ORDER': array.array('I', sorted(range(len(pincodes)), key=load_values.__getitem__)).tobytes(),
+        'REDIRECT_PTR': array.array('I', ptr).tobytes(),
+        'REDIRECT_DST': array.array('I', dst).tobytes(),
+        'REDIRECT_SHR': array.array('f', share).tobytes(),
+        'REDIRECT_FRAC': array.array('f', fraction).tobytes(),
+    }
+
+    flags = (FLAG_FORECAST_LOADS if load_forecast() is not None else 0) | \
+            (FLAG_REDIRECT_PLAN if plan is not None else 0)
+    header = HEADER.pack(MAGIC, VERSION, 0 if sys.byteorder == 'little' else 1,
+                         flags, len(pincodes), int(time.time()))
+    offset = HEADER.size + SECTION.size * len(SECTIONS)
+    table, body = b'', b''
+    for name in SECTIONS:
+        # 8-byte alignment keeps every array castable in place
+        body += b'\0' * (-(offset + len(body)) % 8)
+        table += SECTION.pack(offset + len(body), len(sections[name]))
+        body += sections[name]
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(header + table + body)
+    os.replace(tmp, path)   # kiosks never see a half-written file
+    return len(header + table + body)
+
+
+# ==========================================
+# 📥 LOADER (kiosk side, standard library only)
+# ==========================================
+class KioskSnapshot:
+    """Memory-mapped, read-only view of a snapshot file."""
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, order, self.flags, self.n, self.built_at = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f"'{path}' is not a version {VERSION} kiosk snapshot")
+        if order != (0 if sys.byteorder == 'little' else 1):
+            raise SnapshotError(f"'{path}' was written on a machine with a different byte order")
+
+        view = memoryview(self._mm)
+        self._views = [view]        # every export of the mmap, released on close()
+        formats = {'PINCODES': 'I', 'LOADS': 'f', 'THRESHOLDS': 'd', 'ROUTING_ORDER': 'I',
+                   'REDIRECT_PTR': 'I', 'REDIRECT_DST': 'I', 'REDIRECT_SHR': 'f', 'REDIRECT_FRAC': 'f'}
+        self._sections = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = SECTION.unpack_from(self._mm, HEADER.size + i * SECTION.size)
+            chunk = view[offset:offset + length]
+            self._views.append(chunk)
+            if name in formats:
+                chunk = chunk.cast(formats[name])
+                self._views.append(chunk)
+            self._sections[name] = chunk
+
+        self.pincodes = self._sections['PINCODES']
+        self.loads = self._sections['LOADS']
+        self.thresholds = dict(zip(THRESHOLD_NAMES, self._sections['THRESHOLDS']))
+
+    def index(self, pincode):
+        """Position of a pincode in the snapshot, or -1 if unknown."""
+        try:
+            pin = int(pincode)
+        except (TypeError, ValueError):
+            return -1
+        i = bisect.bisect_left(self.pincodes, pin)
+        return i if i < self.n and self.pincodes[i] == pin else -1
+
+    def _bit(self, name, i):
+        return i >= 0 and bool(self._sections[name][i >> 3] & (1 << (i & 7)))
+
+    def load(self, pincode):
+        i = self.index(pincode)
+        return self.loads[i] if i >= 0 else None
+
+    def is_overloaded(self, pincode):
+        load = self.load(pincode)
+        return load is not None and load > self.thresholds['stress']
+
+    def is_maternity_hub(self, pincode):
+        return self._bit('HUBS', self.index(pincode))
+
+    def is_fraud_zone(self, pincode):
+        return self._bit('FRAUD', self.index(pincode))
+
+    def is_school_cluster(self, pincode):
+        return self._bit('SCHOOLS', self.index(pincode))
+
+    def redirects(self, pincode):
+        """[(destination pincode, share), ...] from the rebalancing plan."""
+        i = self.index(pincode)
+        if i < 0:
+            return []
+        ptr, dst, shr = (self._sections[k] for k in ('REDIRECT_PTR', 'REDIRECT_DST', 'REDIRECT_SHR'))
+        return [(str(self.pincodes[dst[j]]), shr[j]) for j in range(ptr[i], ptr[i + 1])]
+
+    def redirect_fraction(self, pincode):
+        """Fraction of this center's visitors the rebalancing plan sends elsewhere."""
+        i = self.index(pincode)
+        return self._sections['REDIRECT_FRAC'][i] if i >= 0 else 0.0
+
+    def route(self, pincode):
+        """
+        Center the next visitor at `pincode` should go to (same rules as
+        find_slot), or None for an unknown pincode. Centers under the stress
+        threshold keep their visitors. An overloaded center sends the planned
+        redirect fraction to a destination picked by share; without a plan
+        entry its visitors stay, and only if no plan was built at all are
+        they sent to the emptiest center.
+        """
+        i = self.index(pincode)
+        if i < 0:
+            return None
+        here = str(self.pincodes[i])
+        if self.loads[i] <= self.thresholds['stress']:
+            return here
+        options = self.redirects(pincode)
+        if options:
+            if random.random() >= self._sections['REDIRECT_FRAC'][i]:
+                return here
+            destinations, shares = zip(*options)
+            return random.choices(destinations, weights=shares)[0]
+        if self.flags & FLAG_REDIRECT_PLAN:
+            return here
+        return str(self.pincodes[self._sections['ROUTING_ORDER'][0]])
+
+    def close(self):
+        self.pincodes = self.loads = None
+        self._sections = {}
+        for view in reversed(self._views):
+            view.release()
+        self._mm.close()
+
+
+# ==========================================
+# 🚀 EXPORT + COLD-START DEMO
+# ==========================================
+if __name__ == "__main__":
+    size = export_snapshot()
+    print(f"✅ Snapshot written to '{SNAPSHOT_PATH}' ({size / 1024:.1f} KB)")
+
+    t0 = time.perf_counter()
+    snapshot = KioskSnapshot()
+    first = snapshot.is_overloaded('400043')
+    print(f"⚡ Cold start + first decision: {(time.perf_counter() - t0) * 1000:.2f} ms")
+    print(f"   {snapshot.n} centers, thresholds {snapshot.thresholds}")
+    print(f"   400043 overloaded={first}, hub={snapshot.is_maternity_hub('400043')}, "
+          f"school cluster={snapshot.is_school_cluster('400043')}, route → {snapshot.route('400043')}")
+    snapshot.close()
@@ -0,0 +1,192 @@
+import os
+import sys
+import time
+import heapq
+import numpy as np
+import pandas as pd
+from demand_forecast import center_load
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+from schema import read_source
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+REDIRECT_PATH = '../../data/processed/redirect_table.csv'
+
+CAPACITY_QUANTILE = 0.80    # A center's capacity = the "RED ZONE" threshold used by find_slot
+TARGET_UTILISATION = 0.90   # Receivers are only filled to 90% so they don't tip over next
+K_NEIGHBOURS = 6            # Candidate destinations per overloaded center
+STAY_PENALTY = 10**9        # Cost of leaving a user at an overloaded center (last resort)
+
+
+# ==========================================
+# 🧠 MIN-COST FLOW SOLVER (successive shortest paths)
+# ==========================================
+class MinCostFlow:
+    """
+    Small, dependency-free min-cost-flow solver. Dijkstra with Johnson
+    potentials finds each augmenting path; a district-sized transport
+    problem (hundreds of centers, a few thousand arcs) solves in milliseconds.
+    """
+
+    def __init__(self, n_nodes):
+        self.graph = [[] for _ in range(n_nodes)]
+
+    def add_edge(self, u, v, capacity, cost):
+        """Adds u -> v and its residual; returns a handle to read the flow later."""
+        self.graph[u].append([v, capacity, cost, len(self.graph[v])])
+        self.graph[v].append([u, 0, -cost, len(self.graph[u]) - 1])
+        return u, len(self.graph[u]) - 1
+
+    def flow_on(self, handle, capacity):
+        u, i = handle
+        return capacity - self.graph[u][i][1]
+
+    def solve(self, source, sink):
+        n = len(self.graph)
+        potential = [0] * n
+        total_flow = total_cost = 0
+        while True:
+            dist = [float('inf')] * n
+            prev = [None] * n
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                for i, (v, cap, cost, _) in enumerate(self.graph[u]):
+                    nd = d + cost + potential[u] - potential[v]
+                    if cap > 0 and nd < dist[v]:
+                        dist[v] = nd
+                        prev[v] = (u, i)
+                        heapq.heappush(heap, (nd, v))
+            if dist[sink] == float('inf'):
+                return total_flow, total_cost
+            for v in range(n):
+                if dist[v] < float('inf'):
+                    potential[v] += dist[v]
+
+            # Push the bottleneck amount along the path
+            push, v = float('inf'), sink
+            while v != source:
+                u, i = prev[v]
+                push = min(push, self.graph[u][i][1])
+                v = u
+            v = sink
+            while v != source:
+                u, i = prev[v]
+                edge = self.graph[u][i]
+                edge[1] -= push
+                self.graph[v][edge[3]][1] += push
+                v = u
+            total_flow += push
+            total_cost += push * (potential[sink] - potential[source])
+
+
+# ==========================================
+# 🗺️ REBALANCING PLAN
+# ==========================================
+def neighbours(pincodes, k=K_NEIGHBOURS):
+    """
+    k nearest pincodes by number, with |difference| as the travel cost.
+    Pincodes are allotted geographically, so numeric distance is a usable
+    stand-in until GPS coordinates of centers are available.
+    """
+    codes = np.array([int(p) for p in pincodes])
+    dist = np.abs(codes[:, None] - codes[None, :]).astype(np.float64)
+    np.fill_diagonal(dist, np.inf)
+    k = min(k, len(codes) - 1)
+    nearest = np.argpartition(dist, k - 1, axis=1)[:, :k] if k > 0 else np.empty((len(codes), 0), dtype=int)
+    return nearest, dist
+
+
+def rebalance_district(loads, capacity, k=K_NEIGHBOURS):
+    """
+    Moves excess load from centers above `capacity` to nearby centers with
+    spare room, at minimum total travel cost. Returns rows of
+    (source, destination, users, share of the source's excess,
+    redirect fraction = users planned to leave the source / its load).
+    """
+    pincodes = list(loads.index)
+    values = loads.to_numpy(dtype=np.float64)
+    excess = np.clip(np.round(values - capacity), 0, None).astype(np.int64)
+    spare = np.clip(np.round(capacity * TARGET_UTILISATION - values), 0, None).astype(np.int64)
+    if not excess.any() or not spare.any():
+        return []
+
+    nearest, dist = neighbours(pincodes, k)
+    n = len(pincodes)
+    source, sink = 2 * n, 2 * n + 1      # nodes: 0..n-1 as senders, n..2n-1 as receivers
+    solver = MinCostFlow(2 * n + 2)
+    arcs = []
+    for i in np.flatnonzero(excess):
+        solver.add_edge(source, i, int(excess[i]), 0)
+        solver.add_edge(i, sink, int(excess[i]), STAY_PENALTY)
+        for j in nearest[i]:
+            if spare[j] > 0:
+                handle = solver.add_edge(i, n + j, int(excess[i]), int(dist[i, j]))
+                arcs.append((i, j, handle, int(excess[i])))
+    for j in np.flatnonzero(spare):
+        solver.add_edge(n + j, sink, int(spare[j]), 0)
+
+    solver.solve(source, sink)
+
+    flows = [(i, j, solver.flow_on(handle, cap)) for i, j, handle, cap in arcs]
+    leaving = np.zeros(n, dtype=np.int64)
+    for i, _, moved in flows:
+        leaving[i] += moved
+    # Only this fraction of a source's visitors is redirected; the rest stay
+    return [(pincodes[i], pincodes[j], moved, moved / excess[i], leaving[i] / values[i])
+            for i, j, moved in flows if moved > 0]
+
+
+def build_redirect_table(loads, districts, capacity):
+    """Solves every district separately and stacks the redirect rows."""
+    rows = []
+    for _, group in loads.groupby(districts.reindex(loads.index)):
+        rows.extend(rebalance_district(group, capacity))
+    table = pd.DataFrame(rows, columns=['source', 'destination', 'users', 'share', 'redirect_fraction'])
+    return table.sort_values(['source', 'share'], ascending=[True, False]).reset_index(drop=True)
+
+
+def load_redirects(path=REDIRECT_PATH):
+    """
+    Redirect table as {source pincode: (redirect fraction, [(destination, share), ...])}
+    for O(1) lookups by the router, or None if the plan has not been built.
+    The router sends a visitor away with probability `redirect fraction`
+    (then picks a destination by share); everyone else stays.
+    """
+    if not os.path.exists(path):
+        return None
+    table = pd.read_csv(path, dtype={'source': str, 'destination': str})
+    return {
+        src: (float(group['redirect_fraction'].iloc[0]), list(zip(group['destination'], group['share'])))
+        for src, group in table.groupby('source', sort=False)
+    }
+
+
+# ==========================================
+# 🚀 BUILD THE PLAN
+# ==========================================
+if __name__ == "__main__":
+    print("🔄 Solving capacity-constrained rebalancing plan...")
+    demo = read_source('demographic')
+    loads, unit = center_load(demo)
+    districts = demo.assign(pincode=demo['pincode'].astype(str)) \
+        .drop_duplicates('pincode').set_index('pincode')['district'].astype(str)
+    capacity = loads.quantile(CAPACITY_QUANTILE)
+
+    t0 = time.perf_counter()
+    table = build_redirect_table(loads, districts, capacity)
+    elapsed = time.perf_counter() - t0
+
+    overloaded = (loads > capacity).sum()
+    print(f"✅ Solved in {elapsed * 1000:.1f} ms: {overloaded} overloaded centers, "
+          f"{table['users'].sum() if len(table) else 0:.0f} {unit} redirected "
+          f"(capacity {capacity:.0f} {unit})")
+    print(table.head(15))
+
+    table.to_csv(REDIRECT_PATH, index=False)
+    print(f"\n🎉 Saved to '{REDIRECT_PATH}'")
@@ -0,0 +1,323 @@
+import os
+import sys
+import time
+import bisect
+import random
+import hashlib
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# ⚙️ CONFIGURATION
+# ==========================================
+VNODES = 64               # Points per shard on the hash ring (smooths the split)
+K_NEAREST = 6             # Nearby centers considered when no redirect plan exists
+STRESS_QUANTILE = 0.80    # Same "RED ZONE" rule as smart_solution_for_demo_data.py
+
+# ==========================================
+# 🌐 STATE-SHARDED ROUTING SERVICE
+# ==========================================
+# Each shard is a worker process owning the centers of some (state, district)
+# regions: their loads and redirect/nearest-center candidates. A front router
+# maps pincode -> region -> shard with a consistent-hash ring, so adding a
+# shard only moves ~1/n of the regions. When the best alternative for an
+# overloaded center lives in another shard, the shard answers with a
+# "forward" and the router asks the owning shard for that center's load.
+# Local processes stand in for nodes; each talks to the router over a Pipe.
+
+
+class HashRing:
+    """Consistent-hash ring of shard names."""
+
+    def __init__(self, nodes, vnodes=VNODES):
+        self.vnodes = vnodes
+        self.points, self.owners = [], []
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(key):
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+    def add(self, node):
+        for i in range(self.vnodes):
+            point = self._hash(f"{node}#{i}")
+            at = bisect.bisect(self.points, point)
+            self.points.insert(at, point)
+            self.owners.insert(at, node)
+
+    def remove(self, node):
+        keep = [i for i, owner in enumerate(self.owners) if owner != node]
+        self.points = [self.points[i] for i in keep]
+        self.owners = [self.owners[i] for i in keep]
+
+    def node_for(self, key):
+        at = bisect.bisect(self.points, self._hash(key)) % len(self.points)
+        return self.owners[at]
+
+
+def region_key(state, district):
+    return f"{state}/{district}"
+
+
+def nearest_centers(pincodes, k=K_NEAREST):
+    """
+    k nearest pincodes by number for every pincode (numeric gap as distance,
+    as in load_rebalancer.py). Works on the sorted order, so it is O(n * k)
+    instead of building the full distance matrix.
+    """
+    codes = np.array([int(p) for p in pincodes])
+    order = np.argsort(codes)
+    ranked = codes[order]
+    offsets = np.concatenate([np.arange(-k, 0), np.arange(1, k + 1)])
+    window = np.arange(len(codes))[:, None] + offsets[None, :]
+    valid = (window >= 0) & (window < len(codes))
+    gaps = np.where(valid, np.abs(ranked[np.clip(window, 0, len(codes) - 1)] - ranked[:, None]), np.inf)
+    k = min(k, len(codes) - 1)
+    pick = np.argsort(gaps, axis=1, kind='stable')[:, :k]
+    neighbours = order[np.take_along_axis(np.clip(window, 0, len(codes) - 1), pick, axis=1)]
+    result = np.empty_like(neighbours)
+    result[order] = neighbours
+    return {pincodes[i]: [pincodes[j] for j in result[i]] for i in range(len(pincodes))}
+
+
+# ==========================================
+# 🧾 ROUTING ANSWERS (same wording as find_slot)
+# ==========================================
+def _answer(kind, pincode, load=None, unit='', destination=None, dest_load=None):
+    if kind == 'unknown':
+        return {"status": "ERROR", "message": "Pincode not found in database.", "color": "gray"}
+    if kind == 'green':
+        return {
+            "status": "GREEN ZONE",
+            "message": f"✅ Pincode {pincode} has normal traffic ({int(load)} {unit}).",
+            "action": "You can proceed to this center.",
+            "benefit": "Expected Wait Time: < 15 mins",
+            "color": "green"
+        }
+    if kind in ('stay', 'planned_stay'):
+        action = ("No nearby center has spare capacity. Please proceed here." if kind == 'stay' else
+                  "Please proceed here. Nearby centers are already taking this center's overflow.")
+        return {
+            "status": "HIGH CONGESTION",
+            "message": f"⚠️ Pincode {pincode} is Overloaded ({int(load)} {unit}).",
+            "action": action,
+            "benefit": "Expected Wait Time: > 30 mins",
+            "color": "orange"
+        }
+    time_saved = (load - dest_load) / 10  # Rough estimate: 10 users = 1 min wait
+    return {
+        "status": "HIGH CONGESTION",
+        "message": f"⚠️ Pincode {pincode} is Overloaded ({int(load)} {unit}).",
+        "action": f"💡 ROUTING: Go to Center {destination} instead.",
+        "benefit": f"📉 Traffic there: {int(dest_load)} {unit}. Est. Time Saved: {int(time_saved)} mins.",
+        "color": "red"
+    }
+
+
+# ==========================================
+# 🧩 SHARD WORKER
+# ==========================================
+class Shard:
+    """Routing state and logic for the centers of the regions one shard owns."""
+
+    def __init__(self, loads, candidates, threshold, unit):
+        self.loads = loads              # pincode -> load (this shard's centers only)
+        self.candidates = candidates    # pincode -> ((fraction, planned [(dst, share)]), nearest [dst])
+        self.threshold = threshold
+        self.unit = unit
+
+    def route(self, pincode):
+        """
+        A finished answer, or ('forward', pincode, load, [(candidate, load or None)], planned)
+        when the walk down the candidates reaches a center held by another shard.
+        """
+        load = self.loads.get(pincode)
+        if load is None:
+            return _answer('unknown', pincode)
+        if load <= self.threshold:
+            return _answer('green', pincode, load, self.unit)
+
+        (fraction, planned), nearest = self.candidates[pincode]
+        if planned:
+            # Plan lookup: only the planned fraction leaves, picked in proportion to share
+            if random.random() >= fraction:
+                return _answer('planned_stay', pincode, load, self.unit)
+            destinations, shares = zip(*planned)
+            order = [random.choices(destinations, weights=shares)[0]]
+        else:
+            order = nearest     # nearest first
+        for i, destination in enumerate(order):
+            dest_load = self.loads.get(destination)
+            if dest_load is None:
+                # Lives in another shard: the router fetches its load and finishes the walk
+                rest = [(d, self.loads.get(d)) for d in order[i:]]
+                return ('forward', pincode, load, rest, bool(planned))
+            if planned or dest_load <= self.threshold:
+                return _answer('redirect', pincode, load, self.unit, destination, dest_load)
+        return _answer('stay', pincode, load, self.unit)
+
+
+def _shard_main(conn, shard):
+    """Worker loop: ('route', [pincodes]) / ('loads', [pincodes]) / ('stop',)."""
+    # Forked workers inherit the parent's random state: reseed so shards draw independently
+    random.seed()
+    while True:
+        message = conn.recv()
+        if message[0] == 'route':
+            conn.send([shard.route(p) for p in message[1]])
+        elif message[0] == 'loads':
+            conn.send([shard.loads.get(p) for p in message[1]])
+        else:
+            conn.close()
+            return
+
+
+# ==========================================
+# 🔀 FRONT ROUTER
+# ==========================================
+class ShardRouter:
+    """Starts one process per shard and routes batches of kiosk requests to them."""
+
+    def __init__(self, loads, regions, redirects=None, n_shards=2, threshold=None, unit='users'):
+        self.unit = unit
+        self.threshold = float(loads.quantile(STRESS_QUANTILE)) if threshold is None else threshold
+        self.ring = HashRing([f"shard-{i}" for i in range(n_shards)])
+        self.directory = {pin: self.ring.node_for(region) for pin, region in regions.items()}
+        self.cross_shard = 0
+
+        nearest = nearest_centers(list(loads.index))
+        parts = {}
+        for pin, load in loads.items():
+            loads_part, cands_part = parts.setdefault(self.directory[pin], ({}, {}))
+            loads_part[pin] = float(load)
+            cands_part[pin] = ((redirects or {}).get(pin, (0.0, [])), nearest[pin])
+
+        methods = mp.get_all_start_methods()
+        ctx = mp.get_context('fork' if 'fork' in methods else 'spawn')
+        self.conns, self.procs = {}, []
+        for node, (loads_part, cands_part) in parts.items():
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_shard_main, daemon=True,
+                               args=(child, Shard(loads_part, cands_part, self.threshold, unit)))
+            proc.start()
+            child.close()
+            self.conns[node] = parent
+            self.procs.append(proc)
+
+    def _scatter(self, op, by_node):
+        """Sends every shard its batch first, then collects: shards work in parallel."""
+        for node, pins in by_node.items():
+            self.conns[node].send((op, pins))
+        return {node: self.conns[node].recv() for node in by_node}
+
+    def route_batch(self, pincodes):
+        pincodes = [str(p).strip() for p in pincodes]
+        by_node, slots = {}, {}
+        for i, pin in enumerate(pincodes):
+            node = self.directory.get(pin)
+            if node is None:
+                continue
+            by_node.setdefault(node, []).append(pin)
+            slots.setdefault(node, []).append(i)
+
+        results = [_answer('unknown', p) for p in pincodes]
+        pending = []
+        for node, answers in self._scatter('route', by_node).items():
+            for i, answer in zip(slots[node], answers):
+                if isinstance(answer, tuple):
+                    pending.append((i, answer))
+                else:
+                    results[i] = answer
+        if pending:
+            self._finish_forwards(results, pending)
+        return results
+
+    def _finish_forwards(self, results, pending):
+        """Cross-shard fallback: fetch the remote candidates' loads, then take the first with room."""
+        wanted = {}
+        for _, (_, _, _, rest, _) in pending:
+            for dest, dest_load in rest:
+                if dest_load is None:
+                    wanted.setdefault(self.directory[dest], set()).add(dest)
+        by_node = {node: sorted(pins) for node, pins in wanted.items()}
+        remote_loads = {}
+        for node, loads in self._scatter('loads', by_node).items():
+            remote_loads.update(zip(by_node[node], loads))
+
+        for i, (_, pincode, load, rest, planned) in pending:
+            self.cross_shard += 1
+            for dest, dest_load in rest:
+                dest_load = remote_loads[dest] if dest_load is None else dest_load
+                if planned or dest_load <= self.threshold:
+                    results[i] = _answer('redirect', pincode, load, self.unit, dest, dest_load)
+                    break
+            else:
+                results[i] = _answer('stay', pincode, load, self.unit)
+
+    def route(self, pincode):
+        return self.route_batch([pincode])[0]
+
+    def close(self):
+        for conn in self.conns.values():
+            conn.send(('stop',))
+        for proc in self.procs:
+            proc.join()
+
+
+# ==========================================
+# 🧪 SYNTHETIC NATIONAL NETWORK (for benchmarks)
+# ==========================================
+def synthetic_network(states=8, districts=6, centers=60, seed=0):
+    """Loads and regions shaped like the real data, with contiguous pincode blocks per district."""
+    rng = np.random.default_rng(seed)
+    pins, regions = [], {}
+    for s in range(states):
+        for d in range(districts):
+            base = 110000 + s * 100000 + d * 1000
+            for pin in (base + np.sort(rng.choice(999, centers, replace=False))).astype(str):
+                pins.append(pin)
+                regions[pin] = region_key(f"State-{s}", f"District-{d}")
+    loads = pd.Series(rng.lognormal(4.5, 0.8, len(pins)), index=pins)
+    return loads, regions
+
+
+def benchmark(shard_counts=(1, 2, 4, 8), requests=40_000, batch=2_000):
+    loads, regions = synthetic_network()
+    traffic = np.random.default_rng(1).choice(loads.index.to_numpy(), requests, p=loads / loads.sum())
+    rows = []
+    for n in shard_counts:
+        router = ShardRouter(loads, regions, n_shards=n)
+        t0 = time.perf_counter()
+        for start in range(0, requests, batch):
+            router.route_batch(traffic[start:start + batch])
+        elapsed = time.perf_counter() - t0
+        rows.append((n, len(router.procs), requests / elapsed, router.cross_shard / requests))
+        router.close()
+    return pd.DataFrame(rows, columns=['shards', 'live_workers', 'requests_per_s', 'cross_shard_share'])
+
+
+# ==========================================
+# 🚀 REAL DATA ROUTING + SCALING BENCHMARK
+# ==========================================
+if __name__ == "__main__":
+    from demand_forecast import center_load
+    from load_rebalancer import load_redirects
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+    from schema import read_source
+
+    demo = read_source('demographic')
+    loads, unit = center_load(demo)
+    first = demo.assign(pincode=demo['pincode'].astype(str)).drop_duplicates('pincode').set_index('pincode')
+    regions = {pin: region_key(row['state'], row['district']) for pin, row in first.iterrows()}
+
+    router = ShardRouter(loads, regions, load_redirects(), n_shards=4, unit=unit)
+    print(f"✅ {len(loads)} centers in {len(set(regions.values()))} region(s) on {len(router.procs)} live shard(s)")
+    for pin in ['400043', '400050', '999999']:
+        answer = router.route(pin)
+        print(f"   {pin}: {answer['status']} - {answer.get('action', answer['message'])}")
+    router.close()
+
+    print(f"\n⏱️ Throughput on a synthetic network (8 states x 6 districts x 60 centers), {os.cpu_count()} CPU(s):")
+    print(benchmark().round(3).to_string(index=False))
@@ -1,46 +1,90 @@
-import pandas as pd
+import os
+import sys
 import numpy as np
+from demand_forecast import center_load, FORECAST_PATH
+from load_rebalancer import load_redirects, REDIRECT_PATH
+from cohort_projection import PROJECTION_PATH
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'general'))
+from schema import read_source, SchemaError
+from decision_table import DecisionTable, WeightedChoice, content_hash
+from audit_log import AuditLog, version_of
 
 # ==========================================
 # ⚙️ CONFIGURATION & DATA LOADING
 # ==========================================
-FILE_PATH = '../../data/processed/cleaned_monthly_enrollment_data.csv'
+# Routing runs on demographic-update traffic (demo_age_* columns)
+FILE_PATH = '../../data/raw/demographics.csv'
 
 
 
 print("🔄 Initializing Aadhaar Smart-Flow System...")
 
 try:
-    # Load the historical data
-    df = pd.read_csv(FILE_PATH)
+    # Load the historical data (header and values are validated up front)
+    df = read_source('demographic', FILE_PATH)
     
     # Preprocessing: Ensure Pincode is treated as a string (ID), not a number
     df['pincode'] = df['pincode'].astype(str)
     
     # Calculate the "Load Score" for each center
-    # We use the AVERAGE monthly volume to determine typical stress levels
-    if 'total_updates' not in df.columns:
-        df['total_updates'] = df['demo_age_5_17'] + df['demo_age_above_17']
-        
-    center_stats = df.groupby('pincode')['total_updates'].mean().sort_values(ascending=False)
+    # Preferred: next-week forecast from demand_forecast.py (tracks the Nov-Dec surge)
+    # Fallback: the AVERAGE monthly volume (lags behind sudden surges)
+    center_stats, LOAD_UNIT = center_load(df)
+    if os.path.exists(FORECAST_PATH):
+        print(f"📈 Using demand forecast from '{FORECAST_PATH}'")
+    if os.path.exists(PROJECTION_PATH):
+        print(f"🔮 Including projected mandatory updates from '{PROJECTION_PATH}'")
     
     # Define the "High Stress" Threshold (Top 20% of centers)
     # Any center with traffic higher than this number is a "RED ZONE"
     stress_threshold = center_stats.quantile(0.80)
     
+    # Capacity-aware redirect plan from load_rebalancer.py (source -> destinations with shares)
+    redirects = load_redirects()
+    if redirects is not None:
+        print(f"🗺️ Redirect plan loaded from '{REDIRECT_PATH}' ({len(redirects)} overloaded centers)")
+    
     print(f"✅ System Ready! Database contains {len(center_stats)} centers.")
-    print(f"📊 High-Traffic Threshold: > {stress_threshold:.0f} users/month")
+    print(f"📊 High-Traffic Threshold: > {stress_threshold:.0f} {LOAD_UNIT}")
     print("---------------------------------------------------\n")
 
 except FileNotFoundError:
     print(f"❌ ERROR: Could not find '{FILE_PATH}'.")
-    print("Please make sure the cleaned CSV file is in the same folder.")
+    print("Please make sure the raw demographic CSV file is in data/raw/.")
+    exit()
+except SchemaError as err:
+    print(f"❌ ERROR: {err}")
     exit()
 
 # ==========================================
 # 🧠 THE SMART LOGIC ENGINE
 # ==========================================
-def find_slot(user_pincode):
+def _redirect_result(user_pincode, current_load, recommendation):
+    rec_load = center_stats[recommendation]
+    
+    time_saved = (current_load - rec_load) / 10 # Rough estimate: 10 users = 1 min wait
+    
+    return {
+        "status": "HIGH CONGESTION",
+        "message": f"⚠️ Pincode {user_pincode} is Overloaded ({int(current_load)} {LOAD_UNIT}).",
+        "action": f"💡 ROUTING: Go to Center {recommendation} instead.",
+        "benefit": f"📉 Traffic there: {int(rec_load)} {LOAD_UNIT}. Est. Time Saved: {int(time_saved)} mins.",
+        "recommendation": recommendation,
+        "color": "red"
+    }
+
+def _stay_result(user_pincode, current_load, action):
+    return {
+        "status": "HIGH CONGESTION",
+        "message": f"⚠️ Pincode {user_pincode} is Overloaded ({int(current_load)} {LOAD_UNIT}).",
+        "action": action,
+        "benefit": "Expected Wait Time: > 30 mins",
+        "color": "orange"
+    }
+
+def slot_options(user_pincode):
+    """Every answer find_slot() can give: one result, or a WeightedChoice of redirects."""
     user_pincode = str(user_pincode).strip()
     
     # 1. VALIDATION: Does the center exist?
@@ -56,30 +100,71 @@ def find_slot(user_pincode):
     # 2. DECISION: Is it a "Red Zone"?
     if current_load > stress_threshold:
         # LOGIC: Find the best alternative
-        # In a real app, this would use GPS coordinates to find the *nearest* one.
-        # For this Hackathon demo, we find the *lowest traffic* center in the list.
-        recommendation = center_stats.idxmin() # Finds the center with lowest load
-        rec_load = center_stats.min()
-        
-        time_saved = (current_load - rec_load) / 10 # Rough estimate: 10 users = 1 min wait
-        
-        return {
-            "status": "HIGH CONGESTION",
-            "message": f"⚠️ Pincode {user_pincode} is Overloaded ({int(current_load)} users/mo).",
-            "action": f"💡 ROUTING: Go to Center {recommendation} instead.",
-            "benefit": f"📉 Traffic there: {int(rec_load)} users (Empty). Est. Time Saved: {int(time_saved)} mins.",
-            "color": "red"
-        }
+        if redirects is not None:
+            # Plan lookup: only the planned fraction of visitors is sent away,
+            # to nearby centers picked in proportion to their share, so no
+            # destination receives more than the plan moves there.
+            fraction, options = redirects.get(user_pincode, (0.0, []))
+            if not options:
+                return _stay_result(user_pincode, current_load,
+                                    "No nearby center has spare capacity. Please proceed here.")
+            total = sum(share for _, share in options)
+            stay = _stay_result(user_pincode, current_load,
+                                "Please proceed here. Nearby centers are already taking this center's overflow.")
+            return WeightedChoice([
+                (fraction * share / total, _redirect_result(user_pincode, current_load, destination))
+                for destination, share in options
+            ] + [(1.0 - fraction, stay)])
+        # No plan built yet: fall back to the *lowest traffic* center in the list.
+        return _redirect_result(user_pincode, current_load, center_stats.idxmin())
     
     else:
         return {
             "status": "GREEN ZONE",
-            "message": f"✅ Pincode {user_pincode} has normal traffic ({int(current_load)} users/mo).",
+            "message": f"✅ Pincode {user_pincode} has normal traffic ({int(current_load)} {LOAD_UNIT}).",
             "action": "You can proceed to this center.",
             "benefit": "Expected Wait Time: < 15 mins",
             "color": "green"
         }
 
+def find_slot(user_pincode):
+    result = slot_options(user_pincode)
+    return result.pick() if isinstance(result, WeightedChoice) else result
+
+# ==========================================
+# ⚡ COMPILED KIOSK TABLE
+# ==========================================
+# Every pincode's answer is precomputed once, so a kiosk decision is a
+# single indexed lookup (plus a weighted pick for redirected centers).
+def compile_slot_table(table=None):
+    """Builds the table, or returns `table` as-is if loads/thresholds are unchanged."""
+    fingerprint = (float(stress_threshold), LOAD_UNIT, redirects, content_hash(center_stats))
+    if table is not None and table.is_current(fingerprint):
+        return table
+    return DecisionTable.compile(center_stats.index, [], slot_options, fingerprint)
+
+slot_table = compile_slot_table()
+lookup_slot = slot_table.lookup
+
+# ==========================================
+# 🧾 DECISION AUDIT TRAIL
+# ==========================================
+# Redirects are recorded in the buffered audit log instead of being lost after printing.
+audit = AuditLog()
+AUDIT_VERSION = version_of(float(stress_threshold), LOAD_UNIT, redirects)
+
+def find_slot_fast(user_pincode):
+    """Same answer as find_slot(), served from the compiled table (and audited)."""
+    result = lookup_slot(user_pincode)
+    if 'recommendation' in result:
+        audit.record('route', user_pincode, 'REDIRECT', target=result['recommendation'], version=AUDIT_VERSION)
+    elif result['status'] == "ERROR":
+        audit.record('route', user_pincode, 'UNKNOWN', version=AUDIT_VERSION)
+    else:
+        outcome = 'GREEN_ZONE' if result['status'] == "GREEN ZONE" else 'STAY'
+        audit.record('route', user_pincode, outcome, version=AUDIT_VERSION)
+    return result
+
 # ==========================================
 # 🚀 INTERACTIVE DEMO LOOP
 # ==========================================
@@ -90,7 +175,7 @@ if __name__ == "__main__":
             print("Exiting System.")
             break
             
-        result = find_slot(user_input)
+        result = find_slot_fast(user_input)
         
         # Pretty Print the Output
         print("\n" + "="*40)